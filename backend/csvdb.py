@@ -8,20 +8,60 @@ CSV schemas:
 """
 from __future__ import annotations
 
+import atexit
 import csv
+import logging
+import os
 import threading
-from dataclasses import dataclass, field, asdict
+import time
+from operator import itemgetter
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime, date
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from . import localdb
+from .utils import RWLock, atomic_write, normalize_nfc_tag
 
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 REAGENTS_CSV = DATA_DIR / "reagents.csv"
 USAGE_CSV = DATA_DIR / "usage_logs.csv"
-_lock = threading.Lock()
+# 읽기(조회)는 동시에, 쓰기는 하나씩만
+_rwlock = RWLock()
+_refresh_lock = threading.Lock()  # 읽기 잠금 안에서 캐시를 다시 채울 때 한 번만 파싱하도록
+
+# 파싱 결과 캐시: 파일의 (mtime_ns, size)가 그대로면 CSV를 다시 읽지 않음
+# dirty가 True인 동안은 메모리가 최신이고 파일 저장은 백그라운드 스레드가 맡음 (WRITE_BEHIND일 때만)
+_CACHE: Dict[str, Any] = {
+    "key": None, "items": None, "by_id": {}, "by_slug": {}, "by_nfc": {}, "by_name": {}, "dup_slugs": set(), "max_id": 0,
+    "dirty": False, "gen": 0, "dicts": None, "locations": None,
+}
+# by_reagent: (items, {reagent_id: [기록, ...]}) 쌍. 시약별 기록을 전체 목록을 훑지 않고 찾기 위한 색인
+_LOG_CACHE: Dict[str, Any] = {"key": None, "items": None, "by_reagent": None}
+# 사용 기록의 마지막 ID (파일 상태가 바뀌면 파일 끝 한 줄만 다시 읽음)
+_LOG_ID: Dict[str, Any] = {"key": None, "max_id": None}
+
+logger = logging.getLogger(__name__)
+
+# reagents.csv 저장 방식. 기본은 변경마다 바로 파일에 쓰고, 저장되어야 성공으로 응답함
+# CSVDB_WRITE_BEHIND=1이면 백그라운드 저장: 연속된 변경을 _WRITE_DELAY 동안 모아서 한 번에 씀
+# (빠르지만, 저장 전에 프로세스가 강제 종료되면 이미 성공으로 응답한 변경을 잃을 수 있음)
+WRITE_BEHIND = os.environ.get("CSVDB_WRITE_BEHIND", "0") == "1"
+_WRITE_DELAY = 0.1
+_RETRY_DELAY_MAX = 30.0  # 저장 실패 시 백그라운드 재시도 간격 상한 (1초부터 두 배씩)
+_FLUSH_ATTEMPTS = 3  # flush()가 포기하기 전까지 시도하는 횟수
+_writer_cv = threading.Condition()
+# error: 마지막 저장 실패 (OSError). 저장에 성공하면 None으로 돌아감
+_writer: Dict[str, Any] = {"thread": None, "error": None}
+_file_lock = threading.Lock()  # 저장 스레드와 flush()가 동시에 파일을 쓰지 않도록
+
+REAGENT_FIELDS = [
+    "id", "slug", "name", "formula", "cas", "location", "storage", "state", "expiry",
+    "hazard", "ghs", "disposal", "density", "volume_ml", "nfc_tag_uid",
+    "scale_device", "metallicity", "element_group", "quantity", "used", "discarded", "created_at", "updated_at"
+]
+LOG_FIELDS = ["id", "reagent_id", "prev_qty", "new_qty", "delta", "source", "note", "created_at"]
 
 
 @dataclass
@@ -70,8 +110,27 @@ def _ensure_data_dir() -> None:
     DATA_DIR.mkdir(exist_ok=True)
 
 
+def _file_key(path: Path) -> Optional[tuple]:
+    """캐시 키로 쓸 파일 상태 (mtime_ns, size). 파일이 없으면 None"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _column_getter(header: List[str], fields: List[str]):
+    """헤더 순서와 상관없이 fields 순서대로 값을 꺼내는 (itemgetter, 최소 행 길이)
+    
+    헤더에 없는 컬럼은 행 끝에 덧붙인 빈 문자열 자리를 가리킴
+    """
+    col = {name: i for i, name in enumerate(header)}
+    width = len(header)
+    return itemgetter(*(col.get(name, width) for name in fields)), width + 1
+
+
 def _get_next_id(csv_path: Path) -> int:
-    """CSV에서 다음 ID 생성"""
+    """CSV 전체를 훑어 다음 ID 생성 (끝에서 ID를 알 수 없을 때만 사용)"""
     if not csv_path.exists():
         return 1
     with csv_path.open("r", encoding="utf-8") as f:
@@ -81,89 +140,340 @@ def _get_next_id(csv_path: Path) -> int:
 
 
 def _read_reagents() -> List[Reagent]:
-    """모든 시약 읽기"""
+    """모든 시약 읽기
+    
+    DictReader 대신 csv.reader + 컬럼 인덱스로 읽어 행마다 dict를 만들지 않음
+    """
     _ensure_data_dir()
     if not REAGENTS_CSV.exists():
         return []
     
     items: List[Reagent] = []
     with REAGENTS_CSV.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        getter, width = _column_getter(header, REAGENT_FIELDS)
+        pad = [""] * width
         for row in reader:
-            # GHS는 세미콜론으로 구분
-            ghs_raw = (row.get("ghs") or "").strip()
-            ghs = [s.strip() for s in ghs_raw.split(";") if s.strip()]
-            
-            # 숫자 필드 처리
-            density = float(row["density"]) if row.get("density") and row["density"] != "" else None
-            volume_ml = float(row["volume_ml"]) if row.get("volume_ml") and row["volume_ml"] != "" else None
+            if not row:
+                continue
+            if len(row) != width - 1:
+                del row[width - 1:]
+                row += pad[len(row):width - 1]
+            row.append("")
+            (rid, slug, name, formula, cas, location, storage, state, expiry,
+             hazard, ghs_raw, disposal, density, volume_ml, nfc_tag_uid,
+             scale_device, metallicity, element_group, quantity, used, discarded,
+             created_at, updated_at) = getter(row)
             
             items.append(Reagent(
-                id=int(row["id"]),
-                slug=row["slug"],
-                name=row["name"],
-                formula=row["formula"],
-                cas=row.get("cas") or None,
-                location=row["location"],
-                storage=row.get("storage") or None,
-                state=row.get("state") or None,
-                expiry=row.get("expiry") or None,
-                hazard=row.get("hazard") or None,
-                ghs=ghs,
-                disposal=row.get("disposal") or None,
-                density=density,
-                volume_ml=volume_ml,
-                nfc_tag_uid=row.get("nfc_tag_uid") or None,
-                scale_device=row.get("scale_device") or None,
-                metallicity=row.get("metallicity") or None,
-                element_group=row.get("element_group") or None,
-                quantity=float(row["quantity"]),
-                used=float(row.get("used") or 0),
-                discarded=float(row.get("discarded") or 0),
-                created_at=row.get("created_at"),
-                updated_at=row.get("updated_at"),
+                id=int(rid),
+                slug=slug,
+                name=name,
+                formula=formula,
+                cas=cas or None,
+                location=location,
+                storage=storage or None,
+                state=state or None,
+                expiry=expiry or None,
+                hazard=hazard or None,
+                # GHS는 세미콜론으로 구분
+                ghs=[s.strip() for s in ghs_raw.split(";") if s.strip()] if ghs_raw else [],
+                disposal=disposal or None,
+                density=float(density) if density else None,
+                volume_ml=float(volume_ml) if volume_ml else None,
+                nfc_tag_uid=nfc_tag_uid or None,
+                scale_device=scale_device or None,
+                metallicity=metallicity or None,
+                element_group=element_group or None,
+                quantity=float(quantity),
+                used=float(used or 0),
+                discarded=float(discarded or 0),
+                created_at=created_at or None,
+                updated_at=updated_at or None,
             ))
     return items
 
 
-def _write_reagents(items: List[Reagent]) -> None:
-    """모든 시약 쓰기"""
+def _read_reagents_cached() -> List[Reagent]:
+    """캐시된 시약 목록 (reagents.csv가 바뀌었을 때만 다시 파싱). _rwlock 안에서 호출"""
+    if _CACHE["dirty"]:
+        return _CACHE["items"]  # 저장 대기 중인 변경이 있으면 메모리가 최신
+    key = _file_key(REAGENTS_CSV)
+    if _CACHE["items"] is None or _CACHE["key"] != key:
+        with _refresh_lock:
+            key = _file_key(REAGENTS_CSV)
+            if _CACHE["items"] is None or _CACHE["key"] != key:
+                _set_reagent_cache(_read_reagents(), key)
+    return _CACHE["items"]
+
+
+def _nfc_key(tag: str) -> str:
+    """NFC 인덱스 키: 정규화한 UID (16진수가 하나도 없으면 앞뒤 공백만 뗀 원래 값)"""
+    return normalize_nfc_tag(tag) or tag.strip()
+
+
+def _set_reagent_cache(items: List[Reagent], key: Optional[tuple]) -> None:
+    """캐시 교체 + id/slug/NFC/이름 인덱스 재구성 (같은 값이 여러 개면 파일에서 먼저 나온 행 우선)"""
+    by_id: Dict[int, Reagent] = {}
+    by_slug: Dict[str, Reagent] = {}
+    by_nfc: Dict[str, Reagent] = {}
+    by_name: Dict[str, Reagent] = {}
+    dup_slugs = set()
+    for r in items:
+        by_id.setdefault(r.id, r)
+        if by_slug.setdefault(r.slug, r) is not r:
+            dup_slugs.add(r.slug)
+        if r.name:
+            by_name.setdefault(r.name.strip(), r)
+        if r.nfc_tag_uid and r.nfc_tag_uid.strip():
+            by_nfc.setdefault(_nfc_key(r.nfc_tag_uid), r)
+    _CACHE["by_id"] = by_id
+    _CACHE["by_slug"] = by_slug
+    _CACHE["by_nfc"] = by_nfc
+    _CACHE["by_name"] = by_name
+    _CACHE["dup_slugs"] = dup_slugs
+    _CACHE["max_id"] = max(by_id, default=0)
+    _CACHE["dicts"] = None
+    _CACHE["locations"] = None
+    _CACHE["items"] = items
+    _CACHE["key"] = key
+
+
+def _next_reagent_id() -> int:
+    """캐시의 최대 ID로 다음 시약 ID 발급 (파일 재스캔 없음). 쓰기 잠금 안에서 호출"""
+    _read_reagents_cached()
+    _CACHE["max_id"] += 1
+    return _CACHE["max_id"]
+
+
+def _find_reagent(identifier: str) -> Optional[Reagent]:
+    """ID 또는 slug로 캐시에서 O(1) 조회. _rwlock 안에서 호출"""
+    _read_reagents_cached()
+    if identifier.isdigit():
+        found = _CACHE["by_id"].get(int(identifier))
+        if found is not None:
+            return found
+    return _CACHE["by_slug"].get(identifier)
+
+
+def _reagent_row(r: Reagent) -> Dict[str, Any]:
+    """Reagent 객체를 CSV 한 행으로 변환"""
+    return {
+        "id": r.id,
+        "slug": r.slug,
+        "name": r.name,
+        "formula": r.formula,
+        "cas": r.cas or "",
+        "location": r.location,
+        "storage": r.storage or "",
+        "state": r.state or "",
+        "expiry": r.expiry or "",
+        "hazard": r.hazard or "",
+        "ghs": ";".join(r.ghs) if r.ghs else "",
+        "disposal": r.disposal or "",
+        "density": f"{r.density}" if r.density is not None else "",
+        "volume_ml": f"{r.volume_ml}" if r.volume_ml is not None else "",
+        "nfc_tag_uid": r.nfc_tag_uid or "",
+        "scale_device": r.scale_device or "",
+        "metallicity": r.metallicity or "",
+        "element_group": r.element_group or "",
+        "quantity": r.quantity,
+        "used": r.used,
+        "discarded": r.discarded,
+        "created_at": r.created_at or "",
+        "updated_at": r.updated_at or "",
+    }
+
+
+def _write_reagents_file(rows: List[Dict[str, Any]]) -> None:
+    """reagents.csv 전체 쓰기 (임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 원본 유지)"""
     _ensure_data_dir()
-    with REAGENTS_CSV.open("w", encoding="utf-8", newline="") as f:
-        fieldnames = [
-            "id", "slug", "name", "formula", "cas", "location", "storage", "state", "expiry",
-            "hazard", "ghs", "disposal", "density", "volume_ml", "nfc_tag_uid",
-            "scale_device", "metallicity", "element_group", "quantity", "used", "discarded", "created_at", "updated_at"
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    with atomic_write(REAGENTS_CSV) as f:
+        writer = csv.DictWriter(f, fieldnames=REAGENT_FIELDS)
         writer.writeheader()
-        
-        for r in items:
-            writer.writerow({
-                "id": r.id,
-                "slug": r.slug,
-                "name": r.name,
-                "formula": r.formula,
-                "cas": r.cas or "",
-                "location": r.location,
-                "storage": r.storage or "",
-                "state": r.state or "",
-                "expiry": r.expiry or "",
-                "hazard": r.hazard or "",
-                "ghs": ";".join(r.ghs) if r.ghs else "",
-                "disposal": r.disposal or "",
-                "density": f"{r.density}" if r.density is not None else "",
-                "volume_ml": f"{r.volume_ml}" if r.volume_ml is not None else "",
-                "nfc_tag_uid": r.nfc_tag_uid or "",
-                "scale_device": r.scale_device or "",
-                "metallicity": r.metallicity or "",
-                "element_group": r.element_group or "",
-                "quantity": r.quantity,
-                "used": r.used,
-                "discarded": r.discarded,
-                "created_at": r.created_at or "",
-                "updated_at": r.updated_at or "",
-            })
+        writer.writerows(rows)
+
+
+class StorageError(RuntimeError):
+    """reagents.csv를 디스크에 저장하지 못하고 있는 상태
+    
+    저장되지 않은 변경은 메모리에 남아 있고 백그라운드 스레드가 계속 재시도함.
+    저장에 성공할 때까지 새 변경은 받지 않음
+    """
+
+
+def _record_write_error(error: OSError) -> None:
+    """저장 실패를 기록 (같은 실패가 반복되면 로그는 한 번만 error로)"""
+    if _writer["error"] is None:
+        logger.error("Failed to save %s: %s", REAGENTS_CSV.name, error)
+    else:
+        logger.warning("Still failing to save %s: %s", REAGENTS_CSV.name, error)
+    _writer["error"] = error
+
+
+def storage_error() -> Optional[str]:
+    """reagents.csv 저장이 실패하고 있으면 그 이유, 정상이면 None"""
+    error = _writer["error"]
+    return f"Failed to save {REAGENTS_CSV.name}: {error}" if error is not None else None
+
+
+def _save_reagents(items: List[Reagent]) -> None:
+    """items를 저장하고 캐시를 갱신. 쓰기 잠금 안에서 호출
+    
+    기본은 바로 파일에 쓰며, 쓰지 못하면 캐시는 그대로 두고 StorageError.
+    WRITE_BEHIND면 캐시만 갱신하고 파일 저장은 백그라운드 스레드에 맡김
+    (이전 저장이 실패한 상태면 변경을 반영하지 않고 StorageError)
+    """
+    error = _writer["error"]
+    if error is not None:
+        raise StorageError(storage_error()) from error
+    if not WRITE_BEHIND:
+        try:
+            with _file_lock:
+                _write_reagents_file([_reagent_row(r) for r in items])
+                key = _file_key(REAGENTS_CSV)
+        except OSError as e:
+            logger.error("Failed to save %s: %s", REAGENTS_CSV.name, e)
+            raise StorageError(f"Failed to save {REAGENTS_CSV.name}: {e}") from e
+        _set_reagent_cache(items, key)
+        return
+    _set_reagent_cache(items, _CACHE["key"])
+    _CACHE["gen"] += 1
+    _CACHE["dirty"] = True
+    with _writer_cv:
+        thread = _writer["thread"]
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_writer_loop, name="csvdb-writer", daemon=True)
+            _writer["thread"] = thread
+            thread.start()
+        _writer_cv.notify()
+
+
+def _flush_once() -> None:
+    """대기 중인 변경을 한 번 저장 (저장 도중 새 변경이 들어오면 dirty 유지)"""
+    with _rwlock.read_lock():
+        if not _CACHE["dirty"]:
+            return
+        gen = _CACHE["gen"]
+        rows = [_reagent_row(r) for r in _CACHE["items"]]
+    with _file_lock:
+        _write_reagents_file(rows)
+        key = _file_key(REAGENTS_CSV)
+    with _rwlock.write_lock():
+        if _writer["error"] is not None:
+            logger.info("Saved %s after earlier failures", REAGENTS_CSV.name)
+            _writer["error"] = None
+        if _CACHE["gen"] == gen:
+            _CACHE["dirty"] = False
+            _CACHE["key"] = key
+
+
+def _writer_loop() -> None:
+    """백그라운드 저장 스레드: 변경이 생기면 잠시 모았다가 한 번에 저장
+    
+    실패하면 기록해 두고 (storage_error, 다음 변경 시 StorageError) 간격을 늘려 가며 재시도
+    """
+    retry_delay = 1.0
+    while True:
+        with _writer_cv:
+            while not _CACHE["dirty"]:
+                _writer_cv.wait()
+        time.sleep(_WRITE_DELAY)
+        try:
+            _flush_once()
+            retry_delay = 1.0
+        except OSError as e:
+            _record_write_error(e)
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, _RETRY_DELAY_MAX)
+
+
+def flush() -> None:
+    """저장 대기 중인 시약 변경을 지금 바로 파일에 씀 (종료 시 자동 호출)
+    
+    _FLUSH_ATTEMPTS번 연속 실패하면 StorageError
+    """
+    failures = 0
+    while _CACHE["dirty"]:
+        try:
+            _flush_once()
+        except OSError as e:
+            _record_write_error(e)
+            failures += 1
+            if failures >= _FLUSH_ATTEMPTS:
+                raise StorageError(storage_error()) from e
+            time.sleep(0.2 * failures)
+
+
+def _flush_at_exit() -> None:
+    """종료 시 저장. 실패해도 atexit 밖으로 예외를 던지지 않고 잃어버린 변경을 로그로 남김"""
+    try:
+        flush()
+    except StorageError:
+        logger.exception("Unsaved reagent changes were lost at exit")
+
+
+atexit.register(_flush_at_exit)
+
+
+def _can_append_reagent() -> bool:
+    """파일 끝에 한 행만 덧붙여도 되는지 확인 (헤더가 현재 컬럼과 같고 줄바꿈으로 끝나는 경우)"""
+    if not REAGENTS_CSV.exists():
+        return False
+    with REAGENTS_CSV.open("rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), [])
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, 2)
+        ends_with_newline = f.read(1) == b"\n"
+    return header == REAGENT_FIELDS and ends_with_newline
+
+
+def _append_reagent(items: List[Reagent], reagent: Reagent) -> None:
+    """새 시약 한 행만 파일 끝에 추가 (전체 재작성 없이 O(1) 쓰기)
+    
+    items는 reagent가 이미 추가된 전체 목록이며, 저장 대기 중인 변경이 있거나
+    덧붙일 수 없는 파일이면 (예: 예전 헤더) 전체 저장으로 넘김
+    """
+    if _CACHE["dirty"] or not _can_append_reagent():
+        _save_reagents(items)
+        return
+    _CACHE["items"] = None
+    with REAGENTS_CSV.open("a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REAGENT_FIELDS)
+        writer.writerow(_reagent_row(reagent))
+    _set_reagent_cache(items, _file_key(REAGENTS_CSV))
+
+
+def _read_logs_cached() -> List[UsageLog]:
+    """캐시된 전체 사용 기록 (usage_logs.csv가 바뀌었을 때만 다시 파싱). _rwlock 안에서 호출"""
+    key = _file_key(USAGE_CSV)
+    if _LOG_CACHE["items"] is None or _LOG_CACHE["key"] != key:
+        with _refresh_lock:
+            key = _file_key(USAGE_CSV)
+            if _LOG_CACHE["items"] is None or _LOG_CACHE["key"] != key:
+                items = _read_logs()
+                _LOG_CACHE["key"] = key
+                _LOG_CACHE["items"] = items
+    return _LOG_CACHE["items"]
+
+
+def _logs_by_reagent() -> Dict[int, List[UsageLog]]:
+    """시약 ID별 사용 기록 (파일 순서 = 오래된 순). _rwlock 안에서 호출"""
+    items = _read_logs_cached()
+    cached = _LOG_CACHE["by_reagent"]
+    # (items, index) 쌍으로 저장해 다른 스레드가 캐시를 갈아끼운 경우와 섞이지 않도록
+    if cached is not None and cached[0] is items:
+        return cached[1]
+    index: Dict[int, List[UsageLog]] = {}
+    for log in items:
+        index.setdefault(log.reagent_id, []).append(log)
+    _LOG_CACHE["by_reagent"] = (items, index)
+    return index
 
 
 def _read_logs(reagent_id: Optional[int] = None) -> List[UsageLog]:
@@ -174,36 +484,164 @@ def _read_logs(reagent_id: Optional[int] = None) -> List[UsageLog]:
     
     logs: List[UsageLog] = []
     with USAGE_CSV.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        getter, width = _column_getter(header, LOG_FIELDS)
+        pad = [""] * width
         for row in reader:
-            log = UsageLog(
-                id=int(row["id"]),
-                reagent_id=int(row["reagent_id"]),
-                prev_qty=float(row["prev_qty"]),
-                new_qty=float(row["new_qty"]),
-                delta=float(row["delta"]),
-                source=row.get("source") or "manual",
-                note=row.get("note") or None,
-                created_at=row.get("created_at"),
-            )
-            if reagent_id is None or log.reagent_id == reagent_id:
-                logs.append(log)
+            if not row:
+                continue
+            if len(row) != width - 1:
+                del row[width - 1:]
+                row += pad[len(row):width - 1]
+            row.append("")
+            lid, rid, prev_qty, new_qty, delta, source, note, created_at = getter(row)
+            if reagent_id is not None and int(rid) != reagent_id:
+                continue
+            logs.append(UsageLog(
+                id=int(lid),
+                reagent_id=int(rid),
+                prev_qty=float(prev_qty),
+                new_qty=float(new_qty),
+                delta=float(delta),
+                source=source or "manual",
+                note=note or None,
+                created_at=created_at or None,
+            ))
     return logs
 
 
-def _write_log(log: UsageLog) -> None:
-    """사용 기록 추가"""
+def _iter_lines_reversed(path: Path, chunk_size: int = 64 * 1024):
+    """파일 끝에서부터 chunk_size씩 거꾸로 읽으며 한 줄씩 돌려줌 (마지막 줄이 먼저, 첫 줄=헤더가 마지막)"""
+    with path.open("rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        rest = b""
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            rest = lines.pop(0)  # 앞쪽은 잘린 줄일 수 있으므로 다음 청크와 합침
+            for line in reversed(lines):
+                yield line
+        yield rest
+
+
+def _read_logs_tail(reagent_id: int, limit: int, before: Optional[int] = None) -> Optional[List[UsageLog]]:
+    """usage_logs.csv를 뒤에서부터 읽어 해당 시약의 최근 기록 limit개만 반환 (최신순)
+    
+    before가 있으면 ID가 before보다 작은 기록만 (페이지 넘김용)
+    
+    기록은 시간순으로 append되므로 뒤에서부터 읽으면 곧 최신순이고,
+    limit개를 모으면 나머지 이력은 읽지 않음. 따옴표가 있는 줄(여러 줄에 걸친
+    note의 일부일 수 있음)이나 해석할 수 없는 줄을 만나면 None (호출 측에서 전체 읽기로 대체)
+    """
+    with USAGE_CSV.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader([f.readline()]), [])
+    getter, width = _column_getter(header, LOG_FIELDS)
+    pad = [""] * width
+    
+    logs: List[UsageLog] = []
+    lines = _iter_lines_reversed(USAGE_CSV)
+    for raw in lines:
+        # 줄바꿈이 든 값은 따옴표로 감싸여 저장되므로, 따옴표가 있는 줄은 물리적 한 줄만으로
+        # 행을 확정할 수 없음 (필드 수가 우연히 맞는 조각을 기록으로 읽지 않도록)
+        if b'"' in raw:
+            lines.close()
+            return None
+        line = raw.rstrip(b"\r").decode("utf-8")
+        if not line:
+            continue
+        row = next(csv.reader([line]))
+        if row == header:
+            break
+        if len(row) != len(header):
+            lines.close()
+            return None
+        row += pad[len(row):]
+        lid, rid, prev_qty, new_qty, delta, source, note, created_at = getter(row)
+        try:
+            if int(rid) != reagent_id or (before is not None and int(lid) >= before):
+                continue
+            logs.append(UsageLog(
+                id=int(lid),
+                reagent_id=int(rid),
+                prev_qty=float(prev_qty),
+                new_qty=float(new_qty),
+                delta=float(delta),
+                source=source or "manual",
+                note=note or None,
+                created_at=created_at or None,
+            ))
+        except ValueError:
+            lines.close()
+            return None
+        if len(logs) >= limit:
+            break
+    lines.close()
+    return logs
+
+
+def _last_log_id() -> int:
+    """usage_logs.csv 마지막 행의 ID (기록은 ID 순서대로 append되므로 곧 최대 ID)
+    
+    마지막 줄에 따옴표가 있거나 (여러 줄에 걸친 값의 일부일 수 있음) 해석할 수 없으면 전체를 훑음
+    """
+    if not USAGE_CSV.exists():
+        return 0
+    with USAGE_CSV.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader([f.readline()]), [])
+    if "id" not in header:
+        return 0
+    id_col = header.index("id")
+    
+    lines = _iter_lines_reversed(USAGE_CSV)
+    try:
+        for raw in lines:
+            if b'"' in raw:
+                break
+            line = raw.rstrip(b"\r").decode("utf-8")
+            if not line:
+                continue
+            row = next(csv.reader([line]))
+            if row == header:
+                return 0
+            if len(row) == len(header) and row[id_col].isdigit():
+                return int(row[id_col])
+            break
+    finally:
+        lines.close()
+    return _get_next_id(USAGE_CSV) - 1
+
+
+def _next_log_id() -> int:
+    """다음 사용 기록 ID 발급. 쓰기 잠금 안에서 호출"""
+    key = _file_key(USAGE_CSV)
+    if _LOG_ID["max_id"] is None or _LOG_ID["key"] != key:
+        _LOG_ID["max_id"] = _last_log_id()
+        _LOG_ID["key"] = key
+    _LOG_ID["max_id"] += 1
+    return _LOG_ID["max_id"]
+
+
+def _write_logs(logs: List[UsageLog]) -> None:
+    """사용 기록 여러 개를 파일 끝에 한 번에 추가 (created_at은 호출 측에서 채워서 넘김)"""
     _ensure_data_dir()
     file_exists = USAGE_CSV.exists()
+    # 캐시가 최신 상태였다면 추가한 행만 캐시에 붙이고, 아니면 무효화
+    cached = _LOG_CACHE["items"] if _LOG_CACHE["key"] == _file_key(USAGE_CSV) else None
+    _LOG_CACHE["items"] = None
     
     with USAGE_CSV.open("a", encoding="utf-8", newline="") as f:
-        fieldnames = ["id", "reagent_id", "prev_qty", "new_qty", "delta", "source", "note", "created_at"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=LOG_FIELDS)
         
         if not file_exists:
             writer.writeheader()
         
-        writer.writerow({
+        writer.writerows({
             "id": log.id,
             "reagent_id": log.reagent_id,
             "prev_qty": log.prev_qty,
@@ -211,37 +649,112 @@ def _write_log(log: UsageLog) -> None:
             "delta": log.delta,
             "source": log.source,
             "note": log.note or "",
-            "created_at": log.created_at or datetime.utcnow().isoformat(),
-        })
+            "created_at": log.created_at,
+        } for log in logs)
+    key = _file_key(USAGE_CSV)
+    _LOG_ID["key"] = key
+    if cached is not None:
+        cached.extend(logs)
+        # 색인도 같은 목록에서 만든 것이면 추가한 행만 붙임
+        by_reagent = _LOG_CACHE["by_reagent"]
+        if by_reagent is not None and by_reagent[0] is cached:
+            for log in logs:
+                by_reagent[1].setdefault(log.reagent_id, []).append(log)
+        _LOG_CACHE["items"] = cached
+        _LOG_CACHE["key"] = key
 
 
 # ==================== Public API ====================
 
 def list_all_reagents() -> List[Dict[str, Any]]:
-    """모든 시약 목록 반환"""
-    with _lock:
-        items = _read_reagents()
-    return [reagent_to_dict(r) for r in items]
+    """모든 시약 목록 반환
+    
+    dict 변환 결과는 캐시가 바뀔 때까지 재사용하되, 호출 측이 고쳐도 캐시가 오염되지 않도록
+    얕은 복사본을 반환 (Reagent → dict 변환보다 훨씬 가벼움)
+    """
+    with _rwlock.read_lock():
+        items = _read_reagents_cached()
+        cached = _CACHE["dicts"]
+        # (items, dicts) 쌍으로 저장해 다른 읽기 스레드가 캐시를 갈아끼운 경우와 섞이지 않도록
+        if cached is not None and cached[0] is items:
+            dicts = cached[1]
+        else:
+            dicts = [reagent_to_dict(r) for r in items]
+            _CACHE["dicts"] = (items, dicts)
+        return [{**d, "ghs": list(d["ghs"])} for d in dicts]
+
+
+def list_locations(q: Optional[str] = None) -> List[str]:
+    """등록된 시약의 location 목록 (중복 제거, 정렬). q가 있으면 대소문자 무시 부분 일치만
+    
+    정렬된 목록은 캐시가 바뀔 때까지 재사용
+    """
+    with _rwlock.read_lock():
+        items = _read_reagents_cached()
+        cached = _CACHE["locations"]
+        if cached is None or cached[0] is not items:
+            locations = sorted({
+                loc for r in items
+                if isinstance(r.location, str) and (loc := r.location.strip())
+            })
+            cached = (items, locations, [loc.casefold() for loc in locations])
+            _CACHE["locations"] = cached
+    _, locations, folded = cached
+    if not q:
+        return list(locations)
+    q_folded = q.casefold()
+    return [loc for loc, f in zip(locations, folded) if q_folded in f]
 
 
 def get_reagent(identifier: str) -> Optional[Dict[str, Any]]:
     """ID 또는 slug로 시약 조회"""
-    with _lock:
-        items = _read_reagents()
+    with _rwlock.read_lock():
+        r = _find_reagent(identifier)
+        return reagent_to_dict(r) if r is not None else None
+
+
+def unique_slug(base: str, current_id: Optional[int] = None) -> str:
+    """base, base-1, base-2, ... 중 다른 시약이 쓰지 않는 첫 slug (slug 인덱스로 후보마다 O(1))
     
-    for r in items:
-        if identifier.isdigit() and r.id == int(identifier):
-            return reagent_to_dict(r)
-        if r.slug == identifier:
-            return reagent_to_dict(r)
-    return None
+    current_id 시약이 이미 쓰고 있는 slug는 (다른 시약과 겹치지 않는 한) 그대로 사용 가능
+    """
+    with _rwlock.read_lock():
+        _read_reagents_cached()
+        by_slug = _CACHE["by_slug"]
+        dup_slugs = _CACHE["dup_slugs"]
+        candidate = base
+        suffix = 1
+        while True:
+            owner = by_slug.get(candidate)
+            if owner is None or (owner.id == current_id and candidate not in dup_slugs):
+                return candidate
+            candidate = f"{base}-{suffix}"
+            suffix += 1
+
+
+def get_reagent_by_nfc(tag: str) -> Optional[Dict[str, Any]]:
+    """NFC 태그 UID로 시약 조회 (구분자/대소문자 무시, 인덱스로 O(1))"""
+    if not tag or not tag.strip():
+        return None
+    with _rwlock.read_lock():
+        _read_reagents_cached()
+        r = _CACHE["by_nfc"].get(_nfc_key(tag))
+        return reagent_to_dict(r) if r is not None else None
+
+
+def get_reagent_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """이름(앞뒤 공백 무시, 대소문자 구분)으로 시약 조회. 같은 이름이 여러 개면 파일에서 먼저 나온 시약"""
+    with _rwlock.read_lock():
+        _read_reagents_cached()
+        r = _CACHE["by_name"].get(name.strip())
+        return reagent_to_dict(r) if r is not None else None
 
 
 def create_reagent(data: Dict[str, Any]) -> Dict[str, Any]:
     """새 시약 등록"""
-    with _lock:
-        items = _read_reagents()
-        new_id = _get_next_id(REAGENTS_CSV)
+    with _rwlock.write_lock():
+        items = _read_reagents_cached()
+        new_id = _next_reagent_id()
         
         now = datetime.utcnow().isoformat()
         reagent = Reagent(
@@ -275,136 +788,153 @@ def create_reagent(data: Dict[str, Any]) -> Dict[str, Any]:
                 # 계산 실패 시 무시 (CSV 저장 형식 유지)
                 pass
 
-        items.append(reagent)
-        _write_reagents(items)
+        # 캐시 목록을 직접 고치지 않고 새 목록으로 교체 (저장이 거부되면 캐시는 그대로)
+        _append_reagent([*items, reagent], reagent)
+        result = reagent_to_dict(reagent)
     
     # 자동완성 DB에도 추가
     localdb.add_or_update_from_reagent(
-        name=reagent.name,
-        formula=reagent.formula,
-        cas=reagent.cas,
-        storage=reagent.storage,
-        ghs=reagent.ghs,
-        disposal=reagent.disposal,
-        density=reagent.density,
+        name=result["name"],
+        formula=result["formula"],
+        cas=result["cas"],
+        storage=result["storage"],
+        ghs=result["ghs"],
+        disposal=result["disposal"],
+        density=result["density"],
     )
     
-    return reagent_to_dict(reagent)
+    return result
+
+
+# _apply_reagent_update가 data에서 그대로 옮기는 필드 (id, created_at, updated_at은 제외)
+_UPDATABLE_FIELDS = frozenset({
+    "name", "formula", "cas", "location", "storage", "expiry", "state", "hazard", "ghs", "disposal",
+    "density", "volume_ml", "nfc_tag_uid", "scale_device", "metallicity", "element_group",
+    "quantity", "used", "discarded", "slug",
+})
+
+
+def _apply_reagent_update(reagent: Reagent, data: Dict[str, Any], now: str) -> Reagent:
+    """data에 있는 필드만 반영한 reagent의 복사본 (부피 자동 계산, updated_at=now 포함). 쓰기 잠금 안에서 호출
+    
+    캐시의 원본과 인덱스는 그대로 두고, _save_reagents에 넘긴 새 목록으로 교체될 때 함께 갱신됨
+    (저장이 거부되거나 도중에 실패하면 캐시는 바뀌지 않음)
+    """
+    # 업데이트 가능한 필드만 변경 (넘어온 필드만 훑으므로 바뀐 필드 수에 비례)
+    reagent = replace(reagent, **{key: value for key, value in data.items() if key in _UPDATABLE_FIELDS})
+    changed_quantity = "quantity" in data
+    changed_density = "density" in data
+
+    # 자동 부피 갱신: quantity 또는 density가 변경되었고, 별도로 volume_ml을 지정하지 않았다면
+    if ("volume_ml" not in data) and (changed_quantity or changed_density):
+        if (reagent.density is not None) and reagent.density > 0 and (reagent.state == "liquid"):
+            try:
+                reagent.volume_ml = reagent.quantity / reagent.density
+            except Exception:
+                # 계산 실패 시 기존 값 유지
+                pass
+    
+    reagent.updated_at = now
+    return reagent
+
+
+def _replaced(items: List[Reagent], updated: Dict[int, Reagent]) -> List[Reagent]:
+    """items에서 원본 객체(id(원본) -> 새 객체)를 바꿔 넣은 새 목록"""
+    return [updated.get(id(r), r) for r in items]
+
+
+def _sync_localdb(result: Dict[str, Any]) -> None:
+    """수정된 시약 정보를 자동완성 DB에도 반영"""
+    localdb.add_or_update_from_reagent(
+        name=result["name"],
+        formula=result["formula"],
+        cas=result["cas"],
+        storage=result["storage"],
+        ghs=result["ghs"],
+        disposal=result["disposal"],
+        density=result["density"],
+    )
 
 
 def update_reagent(identifier: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """시약 정보 수정"""
-    with _lock:
-        items = _read_reagents()
-        idx = None
-        
-        for i, r in enumerate(items):
-            if (identifier.isdigit() and r.id == int(identifier)) or r.slug == identifier:
-                idx = i
-                break
-        
-        if idx is None:
+    with _rwlock.write_lock():
+        reagent = _find_reagent(identifier)
+        if reagent is None:
             return None
-        
-        reagent = items[idx]
-        
-        # 업데이트 가능한 필드만 변경
-        changed_quantity = False
-        changed_density = False
-        if "name" in data:
-            reagent.name = data["name"]
-        if "formula" in data:
-            reagent.formula = data["formula"]
-        if "cas" in data:
-            reagent.cas = data["cas"]
-        if "location" in data:
-            reagent.location = data["location"]
-        if "storage" in data:
-            reagent.storage = data["storage"]
-        if "expiry" in data:
-            reagent.expiry = data["expiry"]
-        if "state" in data:
-            reagent.state = data["state"]
-        if "hazard" in data:
-            reagent.hazard = data["hazard"]
-        if "ghs" in data:
-            reagent.ghs = data["ghs"]
-        if "disposal" in data:
-            reagent.disposal = data["disposal"]
-        if "density" in data:
-            reagent.density = data["density"]
-            changed_density = True
-        if "volume_ml" in data:
-            reagent.volume_ml = data["volume_ml"]
-        if "nfc_tag_uid" in data:
-            reagent.nfc_tag_uid = data["nfc_tag_uid"]
-        if "scale_device" in data:
-            reagent.scale_device = data["scale_device"]
-        if "metallicity" in data:
-            reagent.metallicity = data["metallicity"]
-        if "element_group" in data:
-            reagent.element_group = data["element_group"]
-        if "quantity" in data:
-            reagent.quantity = data["quantity"]
-            changed_quantity = True
-        if "used" in data:
-            reagent.used = data["used"]
-        if "discarded" in data:
-            reagent.discarded = data["discarded"]
-        if "slug" in data:
-            reagent.slug = data["slug"]
-
-        # 자동 부피 갱신: quantity 또는 density가 변경되었고, 별도로 volume_ml을 지정하지 않았다면
-        if ("volume_ml" not in data) and (changed_quantity or changed_density):
-            if (reagent.density is not None) and reagent.density > 0 and (reagent.state == "liquid"):
-                try:
-                    reagent.volume_ml = reagent.quantity / reagent.density
-                except Exception:
-                    # 계산 실패 시 기존 값 유지
-                    pass
-        
-        reagent.updated_at = datetime.utcnow().isoformat()
-        
-        _write_reagents(items)
+        updated = _apply_reagent_update(reagent, data, datetime.utcnow().isoformat())
+        _save_reagents(_replaced(_CACHE["items"], {id(reagent): updated}))
+        result = reagent_to_dict(updated)
     
     # 자동완성 DB에도 업데이트
-    localdb.add_or_update_from_reagent(
-        name=reagent.name,
-        formula=reagent.formula,
-        cas=reagent.cas,
-        storage=reagent.storage,
-        ghs=reagent.ghs,
-        disposal=reagent.disposal,
-        density=reagent.density,
-    )
+    _sync_localdb(result)
+    return result
+
+
+def update_reagents_bulk(updates: Dict[int, Dict[str, Any]],
+                         log_entries: Optional[List[Dict[str, Any]]] = None) -> Dict[int, Dict[str, Any]]:
+    """여러 시약을 한 번에 수정 ({시약 ID: 수정할 필드})하고 사용 기록도 같은 쓰기 잠금 안에서 추가
+    
+    log_entries의 각 항목은 add_usage_log의 인자와 같은 키(reagent_id, prev_qty, new_qty, delta,
+    source, note)를 가짐. 수정이 저장된 뒤에만 기록을 (파일을 한 번 열어서) 쓰므로, 저장이 거부되면
+    (StorageError) 기록도 남지 않음. 찾을 수 없는 ID는 결과에서 빠지고 그 시약의 기록도 건너뜀
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    with _rwlock.write_lock():
+        now = datetime.utcnow().isoformat()  # 한 번의 일괄 수정은 같은 시각으로 기록
+        replaced: Dict[int, Reagent] = {}
+        for reagent_id, data in updates.items():
+            reagent = _find_reagent(str(reagent_id))
+            if reagent is None:
+                continue
+            updated = _apply_reagent_update(reagent, data, now)
+            replaced[id(reagent)] = updated
+            results[reagent_id] = reagent_to_dict(updated)
+        if replaced:
+            _save_reagents(_replaced(_CACHE["items"], replaced))
+        logs = [
+            UsageLog(
+                id=_next_log_id(),
+                reagent_id=entry["reagent_id"],
+                prev_qty=entry["prev_qty"],
+                new_qty=entry["new_qty"],
+                delta=entry["delta"],
+                source=entry.get("source", "manual"),
+                note=entry.get("note"),
+                created_at=now,
+            )
+            for entry in log_entries or ()
+            if entry["reagent_id"] in results
+        ]
+        if logs:
+            _write_logs(logs)
     
-    return reagent_to_dict(reagent)
+    for result in results.values():
+        _sync_localdb(result)
+    return results
 
 
 def delete_reagent(identifier: str) -> bool:
     """시약 삭제"""
-    with _lock:
-        items = _read_reagents()
-        new_items = []
-        found = False
-        
-        for r in items:
-            if (identifier.isdigit() and r.id == int(identifier)) or r.slug == identifier:
-                found = True
-            else:
-                new_items.append(r)
-        
-        if found:
-            _write_reagents(new_items)
+    with _rwlock.write_lock():
+        if _find_reagent(identifier) is None:
+            return False
         
-        return found
+        # 같은 id/slug를 가진 행은 모두 제거 (기존 동작 유지)
+        target_id = int(identifier) if identifier.isdigit() else None
+        new_items = [
+            r for r in _CACHE["items"]
+            if r.id != target_id and r.slug != identifier
+        ]
+        _save_reagents(new_items)
+        return True
 
 
 def add_usage_log(reagent_id: int, prev_qty: float, new_qty: float, delta: float,
                   source: str = "manual", note: Optional[str] = None) -> Dict[str, Any]:
     """사용 기록 추가"""
-    with _lock:
-        log_id = _get_next_id(USAGE_CSV)
+    with _rwlock.write_lock():
+        log_id = _next_log_id()
         log = UsageLog(
             id=log_id,
             reagent_id=reagent_id,
@@ -415,30 +945,124 @@ def add_usage_log(reagent_id: int, prev_qty: float, new_qty: float, delta: float
             note=note,
             created_at=datetime.utcnow().isoformat(),
         )
-        _write_log(log)
+        _write_logs([log])
     
     return log_to_dict(log)
 
 
-def get_usage_logs(reagent_id: int) -> List[Dict[str, Any]]:
-    """특정 시약의 사용 기록 조회"""
-    with _lock:
-        logs = _read_logs(reagent_id)
+def _update_with_log(reagent: Reagent, data: Dict[str, Any], source: str, note: Optional[str],
+                     delta: Optional[float] = None) -> Reagent:
+    """reagent를 수정해 저장을 요청하고, 저장이 받아들여진 뒤에만 수량 변화를 사용 기록으로 남김. 쓰기 잠금 안에서 호출
     
-    # 최신순 정렬
-    logs.sort(key=lambda x: x.created_at or "", reverse=True)
-    return [log_to_dict(log) for log in logs]
+    delta가 None이면 (새 양 - 이전 양). 저장이 거부되면 (StorageError) 사용 기록도 남지 않음
+    """
+    now = datetime.utcnow().isoformat()
+    prev_qty = reagent.quantity or 0.0
+    updated = _apply_reagent_update(reagent, data, now)
+    new_qty = updated.quantity or 0.0
+    _save_reagents(_replaced(_CACHE["items"], {id(reagent): updated}))
+    _write_logs([UsageLog(
+        id=_next_log_id(),
+        reagent_id=reagent.id,
+        prev_qty=prev_qty,
+        new_qty=new_qty,
+        delta=new_qty - prev_qty if delta is None else delta,
+        source=source,
+        note=note,
+        created_at=now,
+    )])
+    return updated
+
+
+def update_reagent_with_log(identifier: str, data: Dict[str, Any], source: str = "manual",
+                            note: Optional[str] = None, delta: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """시약 수정과 사용 기록 추가를 한 번의 쓰기 잠금 안에서 처리 (시약이 없으면 None)
+    
+    수정이 저장되지 못하면 기록도 남기지 않으므로, 기록만 있고 수량은 그대로인 상태가 생기지 않음
+    """
+    with _rwlock.write_lock():
+        reagent = _find_reagent(identifier)
+        if reagent is None:
+            return None
+        result = reagent_to_dict(_update_with_log(reagent, data, source, note, delta))
+    
+    _sync_localdb(result)
+    return result
+
+
+def record_weight_by_nfc(tag: str, mass: float, source: str = "scale",
+                         note: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """NFC 태그로 찾은 시약의 양을 측정값으로 바꾸고 사용 기록까지 한 번의 쓰기 잠금 안에서 처리
+    
+    액체이고 밀도가 있으면 부피를 다시 계산하고, 아니면 부피는 비움. 시약이 없으면 None
+    """
+    if not tag or not tag.strip():
+        return None
+    with _rwlock.write_lock():
+        _read_reagents_cached()
+        reagent = _CACHE["by_nfc"].get(_nfc_key(tag))
+        if reagent is None:
+            return None
+        volume = None
+        if reagent.state == "liquid" and reagent.density:
+            volume = mass / reagent.density
+        updated = _update_with_log(reagent, {"quantity": mass, "volume_ml": volume}, source, note)
+        result = reagent_to_dict(updated)
+    
+    _sync_localdb(result)
+    return result
+
+
+def _usage_logs(reagent_id: int, limit: Optional[int], before: Optional[int]) -> List[UsageLog]:
+    """get_usage_logs 본체. 읽기 잠금 안에서 호출"""
+    cache_warm = _LOG_CACHE["items"] is not None and _LOG_CACHE["key"] == _file_key(USAGE_CSV)
+    if limit is not None and not cache_warm:
+        logs = _read_logs_tail(reagent_id, limit, before) if USAGE_CSV.exists() else []
+        if logs is not None:
+            return logs
+    logs = []
+    for log in reversed(_logs_by_reagent().get(reagent_id, ())):
+        if before is None or log.id < before:
+            logs.append(log)
+            if limit is not None and len(logs) >= limit:
+                break
+    return logs
+
+
+def get_usage_logs(reagent_id: int, limit: Optional[int] = None,
+                   before: Optional[int] = None) -> List[Dict[str, Any]]:
+    """특정 시약의 사용 기록 조회 (최신순)
+    
+    기록은 시간순으로 추가되므로 파일 역순이 곧 최신순 (정렬 불필요).
+    limit이 있고 캐시가 비어 있으면 파일 끝부분만 읽음.
+    before(기록 ID)를 주면 그보다 이전 기록부터 limit개 (이전 페이지의 마지막 ID를 넘기면 됨)
+    """
+    with _rwlock.read_lock():
+        return [log_to_dict(log) for log in _usage_logs(reagent_id, limit, before)]
+
+
+def get_reagent_usage(identifier: str, limit: Optional[int] = None,
+                      before: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """ID 또는 slug로 시약을 찾아 사용 기록까지 한 번의 잠금 안에서 조회 (시약이 없으면 None)"""
+    with _rwlock.read_lock():
+        r = _find_reagent(identifier)
+        if r is None:
+            return None
+        return [log_to_dict(log) for log in _usage_logs(r.id, limit, before)]
 
 
 def reset_all_stats() -> None:
-    """모든 시약의 used, discarded 초기화"""
-    with _lock:
-        items = _read_reagents()
-        for r in items:
-            r.used = 0.0
-            r.discarded = 0.0
-            r.updated_at = datetime.utcnow().isoformat()
-        _write_reagents(items)
+    """모든 시약의 used, discarded 초기화 (이미 0인 시약은 그대로 두고, 바뀐 게 없으면 저장 생략)"""
+    with _rwlock.write_lock():
+        items = _read_reagents_cached()
+        now = datetime.utcnow().isoformat()  # 한 번의 초기화는 같은 시각으로 기록
+        # 캐시의 원본은 고치지 않고 바뀐 시약만 복사본으로 교체
+        new_items = [
+            replace(r, used=0.0, discarded=0.0, updated_at=now) if (r.used or r.discarded) else r
+            for r in items
+        ]
+        if any(new is not old for new, old in zip(new_items, items)):
+            _save_reagents(new_items)
 
 
 def reagent_to_dict(r: Reagent) -> Dict[str, Any]:
@@ -454,7 +1078,7 @@ def reagent_to_dict(r: Reagent) -> Dict[str, Any]:
         "state": r.state,
         "expiry": r.expiry,
         "hazard": r.hazard,
-        "ghs": r.ghs,
+        "ghs": list(r.ghs),
         "disposal": r.disposal,
         "density": r.density,
         "volume_ml": r.volume_ml,
@@ -8,19 +8,44 @@ The CSV file is stored under reagent-ology/data/autocomplete.csv
 """
 from __future__ import annotations
 
+import bisect
 import csv
+import heapq
+import sys
 import threading
 from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
+
+from .utils import RWLock, atomic_write
 
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 CSV_PATH = DATA_DIR / "autocomplete.csv"
-_lock = threading.Lock()
+# 읽기(조회)는 동시에, 쓰기는 하나씩만
+_rwlock = RWLock()
+_refresh_lock = threading.Lock()  # 읽기 잠금 안에서 캐시를 다시 채울 때 한 번만 파싱하도록
+
+# 파싱 결과 캐시: 파일의 (mtime_ns, size)가 그대로면 CSV를 다시 읽지 않음.
+# bisect 접두어 검색용 정렬 목록도 함께 보관: name_keys[i]는 name_items[i].name_l,
+# syn_keys[i]는 syn_items[i].synonyms_l 중 하나
+FIELDS = ["name", "formula", "synonyms", "cas", "storage", "ghs", "disposal", "density"]
+
+# __slots__ 인스턴스가 더 작고 빨리 만들어짐 (dataclass(slots=)는 3.10 이상)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
+_CACHE: dict = {
+    "key": None, "items": None,
+    "name_keys": [], "name_items": [], "syn_keys": [], "syn_items": [],
+    "by_name": {},  # name_l -> 파일에서 먼저 나온 같은 이름의 항목
+    # 부분 문자열 검색용 열 보기: 모든 항목의 search_l을 \x01로 이어 붙인 문자열과
+    # items[i]가 시작하는 위치 blob_starts[i]
+    "blob": "", "blob_starts": [],
+}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Chemical:
     name: str
     formula: str
@@ -30,6 +55,75 @@ class Chemical:
     ghs: List[str] = field(default_factory=list)
     disposal: Optional[str] = None
     density: Optional[float] = None
+    # search_local이 쓰는 소문자 사본 (인스턴스마다 한 번만 계산).
+    # search_l은 이름과 동의어를 NUL로 이어 붙인 것으로, 부분 문자열 검사를 한 번에 하기 위함
+    name_l: str = field(init=False, repr=False, compare=False)
+    synonyms_l: List[str] = field(init=False, repr=False, compare=False)
+    search_l: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name_l = self.name.lower()
+        self.synonyms_l = [s.lower() for s in self.synonyms]
+        self.search_l = "\0".join([self.name_l, *self.synonyms_l])
+
+
+def _file_key() -> Optional[tuple]:
+    try:
+        st = CSV_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_all_cached() -> List[Chemical]:
+    """캐시된 전체 항목 (파일이 바뀌었을 때만 다시 파싱). _rwlock 안에서 호출"""
+    key = _file_key()
+    if _CACHE["items"] is None or _CACHE["key"] != key:
+        with _refresh_lock:
+            key = _file_key()
+            if _CACHE["items"] is None or _CACHE["key"] != key:
+                _set_cache(_read_all(), key)
+    return _CACHE["items"]
+
+
+def _set_cache(items: List[Chemical], key: Optional[tuple]) -> None:
+    order = sorted(items, key=lambda c: c.name_l)
+    _CACHE["name_keys"] = [c.name_l for c in order]
+    _CACHE["name_items"] = order
+    syns = sorted(((s, c) for c in items for s in c.synonyms_l), key=lambda t: t[0])
+    _CACHE["syn_keys"] = [s for s, _ in syns]
+    _CACHE["syn_items"] = [c for _, c in syns]
+    by_name: dict = {}
+    for c in items:
+        by_name.setdefault(c.name_l, c)
+    _CACHE["by_name"] = by_name
+    starts = []
+    offset = 0
+    for c in items:
+        starts.append(offset)
+        offset += len(c.search_l) + 1
+    _CACHE["blob"] = "\x01".join(c.search_l for c in items)
+    _CACHE["blob_starts"] = starts
+    _CACHE["items"] = items
+    _CACHE["key"] = key
+
+
+def _sorted_with(add: Chemical, remove: Optional[Chemical] = None) -> List[Chemical]:
+    """캐시 항목을 이름순으로 복사하면서 remove를 빼고 add를 넣은 목록
+    
+    전체를 sort(key=name.lower())한 것과 같은 순서를 캐시된 정렬 목록에서 bisect로 찾음.
+    쓰기 잠금 안에서 호출
+    """
+    items = list(_CACHE["name_items"])
+    keys = list(_CACHE["name_keys"])
+    if remove is not None:
+        i = bisect.bisect_left(keys, remove.name_l)
+        while items[i] is not remove:
+            i += 1
+        del items[i]
+        del keys[i]
+    items.insert(bisect.bisect_right(keys, add.name_l), add)
+    return items
 
 
 def _read_all() -> List[Chemical]:
@@ -38,16 +132,25 @@ def _read_all() -> List[Chemical]:
         return []
     items: List[Chemical] = []
     with CSV_PATH.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # 헤더에 없는 컬럼은 행 끝의 빈 칸을 가리킴 (DictReader의 None과 같은 역할),
+        # 헤더보다 긴 행의 나머지 칸은 버림
+        col = {h: i for i, h in enumerate(header)}
+        hlen = len(header)
+        getter = itemgetter(*(col.get(name, hlen) for name in FIELDS))
+        pad = [""] * hlen
         for row in reader:
-            name = (row.get("name") or "").strip()
-            formula = (row.get("formula") or "").strip()
-            syn = (row.get("synonyms") or "").strip()
-            ghs_raw = (row.get("ghs") or "").strip()
-            disposal = (row.get("disposal") or "").strip() or None
-            cas = (row.get("cas") or "").strip() or None
-            storage = (row.get("storage") or "").strip() or None
-            density_raw = (row.get("density") or "").strip()
+            if len(row) != hlen:
+                del row[hlen:]
+                row += pad[len(row):hlen]
+            row.append("")
+            name, formula, syn, cas, storage, ghs_raw, disposal, density_raw = (
+                v.strip() for v in getter(row)
+            )
+            disposal = disposal or None
+            cas = cas or None
+            storage = storage or None
 
             synonyms = [s.strip() for s in syn.split(";") if s.strip()] if syn else []
             ghs = [s.strip() for s in ghs_raw.split(";") if s.strip()] if ghs_raw else []
@@ -77,21 +180,13 @@ def _read_all() -> List[Chemical]:
 
 
 def _write_all(items: List[Chemical]) -> None:
+    """CSV 전체를 다시 쓴 뒤 items를 캐시로 사용. 쓰기 잠금 안에서 호출
+    
+    변경 함수는 캐시 목록의 복사본을 넘기므로 쓰기에 실패해도 캐시는 그대로
+    """
     DATA_DIR.mkdir(exist_ok=True)
-    with CSV_PATH.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "name",
-                "formula",
-                "synonyms",
-                "cas",
-                "storage",
-                "ghs",
-                "disposal",
-                "density",
-            ],
-        )
+    with atomic_write(CSV_PATH) as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
         writer.writeheader()
         for c in items:
             writer.writerow({
@@ -104,27 +199,23 @@ def _write_all(items: List[Chemical]) -> None:
                 "disposal": c.disposal or "",
                 "density": f"{c.density}" if c.density is not None else "",
             })
+    _set_cache(items, _file_key())
 
 
-def list_all() -> List[dict]:
-    with _lock:
-        items = _read_all()
-    return [
-        {
-            "name": c.name,
-            "formula": c.formula,
-            "synonyms": c.synonyms,
-            "cas": c.cas,
-            "storage": c.storage,
-            "ghs": c.ghs,
-            "disposal": c.disposal,
-            "density": c.density,
-        }
-        for c in items
-    ]
+def _to_dict(c: Chemical) -> dict:
+    return {
+        "name": c.name,
+        "formula": c.formula,
+        "synonyms": c.synonyms,
+        "cas": c.cas,
+        "storage": c.storage,
+        "ghs": c.ghs,
+        "disposal": c.disposal,
+        "density": c.density,
+    }
 
 
-def add_item(
+def _new_chemical(
     name: str,
     formula: str,
     synonyms: Optional[List[str]] = None,
@@ -134,56 +225,102 @@ def add_item(
     ghs: Optional[List[str]] = None,
     disposal: Optional[str] = None,
     density: Optional[float] = None,
-) -> dict:
+) -> Chemical:
+    """새 항목의 필드 검증 및 정리"""
     if not name or not formula:
         raise ValueError("name and formula are required")
-    syns = [s.strip() for s in (synonyms or []) if s.strip()]
-    ghs_clean = [s.strip() for s in (ghs or []) if s.strip()]
-    cas_clean = cas.strip() if cas else None
-    storage_clean = storage.strip() if storage else None
-    disposal_clean = disposal.strip() if disposal else None
     density_clean = None
     if density is not None:
         if density <= 0:
             raise ValueError("density must be greater than zero")
         density_clean = float(density)
-    with _lock:
-        items = _read_all()
-        if any(c.name.lower() == name.lower() for c in items):
+    return Chemical(
+        name=name.strip(),
+        formula=formula.strip(),
+        synonyms=[s.strip() for s in (synonyms or []) if s.strip()],
+        cas=cas.strip() if cas else None,
+        storage=storage.strip() if storage else None,
+        ghs=[s.strip() for s in (ghs or []) if s.strip()],
+        disposal=disposal.strip() if disposal else None,
+        density=density_clean,
+    )
+
+
+def list_all() -> List[dict]:
+    with _rwlock.read_lock():
+        items = _read_all_cached()
+    return [_to_dict(c) for c in items]
+
+
+def add_item(
+    name: str,
+    formula: str,
+    synonyms: Optional[List[str]] = None,
+    *,
+    cas: Optional[str] = None,
+    storage: Optional[str] = None,
+    ghs: Optional[List[str]] = None,
+    disposal: Optional[str] = None,
+    density: Optional[float] = None,
+) -> dict:
+    chem = _new_chemical(
+        name, formula, synonyms,
+        cas=cas, storage=storage, ghs=ghs, disposal=disposal, density=density,
+    )
+    with _rwlock.write_lock():
+        _read_all_cached()
+        if name.lower() in _CACHE["by_name"]:
             raise FileExistsError("duplicate name")
-        items.append(
-            Chemical(
-                name=name.strip(),
-                formula=formula.strip(),
-                synonyms=syns,
-                cas=cas_clean,
-                storage=storage_clean,
-                ghs=ghs_clean,
-                disposal=disposal_clean,
-                density=density_clean,
-            )
-        )
-        items.sort(key=lambda c: c.name.lower())
+        _write_all(_sorted_with(chem))
+    return _to_dict(chem)
+
+
+def bulk_add_items(rows: List[dict]) -> List[dict]:
+    """여러 항목을 한 번의 정렬과 파일 쓰기로 추가
+    
+    전부 아니면 전무: 잘못된 행이 있거나 (ValueError) 이름이 이미 있거나
+    rows 안에서 겹치면 (FileExistsError) 아무것도 쓰지 않음
+    """
+    new_items = []
+    for i, row in enumerate(rows):
+        try:
+            new_items.append(_new_chemical(**row))
+        except ValueError as e:
+            raise ValueError(f"item {i}: {e}") from None
+    with _rwlock.write_lock():
+        items = list(_read_all_cached())
+        taken = {c.name_l for c in items}
+        for chem in new_items:
+            if chem.name_l in taken:
+                raise FileExistsError(f"duplicate name: {chem.name}")
+            taken.add(chem.name_l)
+        items.extend(new_items)
+        items.sort(key=lambda c: c.name_l)
         _write_all(items)
-    return {
-        "name": name.strip(),
-        "formula": formula.strip(),
-        "synonyms": syns,
-        "cas": cas_clean,
-        "storage": storage_clean,
-        "ghs": ghs_clean,
-        "disposal": disposal_clean,
-        "density": density_clean,
-    }
+    return [_to_dict(c) for c in new_items]
 
 
 def delete_item(name: str) -> None:
-    with _lock:
-        items = _read_all()
-        new_items = [c for c in items if c.name.lower() != name.lower()]
-        if len(new_items) == len(items):
+    with _rwlock.write_lock():
+        items = _read_all_cached()
+        key = name.lower()
+        if key not in _CACHE["by_name"]:
             raise FileNotFoundError("not found")
-        _write_all(new_items)
+        _write_all([c for c in items if c.name_l != key])
+
+
+def bulk_delete_items(names: List[str]) -> List[str]:
+    """names에 있는 이름(대소문자 무시)의 항목을 한 번의 파일 쓰기로 삭제
+    
+    삭제된 이름 목록을 반환하고, 없는 이름은 무시
+    """
+    targets = {n.lower() for n in names}
+    with _rwlock.write_lock():
+        items = _read_all_cached()
+        removed = [c.name for c in items if c.name_l in targets]
+        if removed:
+            _write_all([c for c in items if c.name_l not in targets])
+    return removed
 
 
 def update_item(
@@ -198,12 +335,11 @@ def update_item(
     disposal: Optional[str] = None,
     density: Optional[float] = None,
 ) -> dict:
-    with _lock:
-        items = _read_all()
-        idx = next((i for i, c in enumerate(items) if c.name.lower() == original_name.lower()), None)
-        if idx is None:
+    with _rwlock.write_lock():
+        _read_all_cached()
+        current = _CACHE["by_name"].get(original_name.lower())
+        if current is None:
             raise FileNotFoundError("not found")
-        current = items[idx]
         new_name = name.strip() if name is not None else current.name
         new_formula = formula.strip() if formula is not None else current.formula
         new_syns = [
@@ -242,9 +378,9 @@ def update_item(
         else:
             new_density = current.density
         # Name change conflict check
-        if new_name.lower() != current.name.lower() and any(c.name.lower() == new_name.lower() for c in items):
+        if new_name.lower() != current.name.lower() and new_name.lower() in _CACHE["by_name"]:
             raise FileExistsError("duplicate name")
-        items[idx] = Chemical(
+        updated = Chemical(
             name=new_name,
             formula=new_formula,
             synonyms=new_syns,
@@ -254,8 +390,7 @@ def update_item(
             disposal=new_disposal,
             density=new_density,
         )
-        items.sort(key=lambda c: c.name.lower())
-        _write_all(items)
+        _write_all(_sorted_with(updated, remove=current))
     return {
         "name": new_name,
         "formula": new_formula,
@@ -285,72 +420,79 @@ def add_or_update_from_reagent(
     if not name or not formula:
         return
     
-    with _lock:
-        items = _read_all()
-        idx = next((i for i, c in enumerate(items) if c.name.lower() == name.lower()), None)
+    with _rwlock.write_lock():
+        _read_all_cached()
+        current = _CACHE["by_name"].get(name.lower())
         
         ghs_clean = [s.strip() for s in (ghs or []) if s.strip()]
         cas_clean = cas.strip() if cas else None
         storage_clean = storage.strip() if storage else None
         disposal_clean = disposal.strip() if disposal else None
         
-        if idx is not None:
-            # 업데이트
-            items[idx] = Chemical(
-                name=name.strip(),
-                formula=formula.strip(),
-                synonyms=items[idx].synonyms,  # 기존 synonyms 유지
-                cas=cas_clean,
-                storage=storage_clean,
-                ghs=ghs_clean,
-                disposal=disposal_clean,
-                density=density,
-            )
-        else:
-            # 추가
-            items.append(
-                Chemical(
-                    name=name.strip(),
-                    formula=formula.strip(),
-                    synonyms=[],
-                    cas=cas_clean,
-                    storage=storage_clean,
-                    ghs=ghs_clean,
-                    disposal=disposal_clean,
-                    density=density,
-                )
-            )
-        
-        items.sort(key=lambda c: c.name.lower())
-        _write_all(items)
+        chem = Chemical(
+            name=name.strip(),
+            formula=formula.strip(),
+            # 업데이트면 기존 synonyms 유지, 추가면 빈 목록
+            synonyms=current.synonyms if current is not None else [],
+            cas=cas_clean,
+            storage=storage_clean,
+            ghs=ghs_clean,
+            disposal=disposal_clean,
+            density=density,
+        )
+        if chem == current:
+            return  # 바뀐 내용이 없으면 파일을 다시 쓰지 않음
+        _write_all(_sorted_with(chem, remove=current))
+
+
+def _prefix_run(keys: List[str], values: List[Chemical], q: str) -> Iterator[Chemical]:
+    """정렬된 key가 q로 시작하는 값들 (연속된 한 구간)"""
+    i = bisect.bisect_left(keys, q)
+    while i < len(keys) and keys[i].startswith(q):
+        yield values[i]
+        i += 1
 
 
 def search_local(query: str, limit: int = 8) -> List[dict]:
     if not query:
         return []
     q = query.strip().lower()
-    with _lock:
-        items = _read_all()
+    with _rwlock.read_lock():
+        items = _read_all_cached()
+        cache = dict(_CACHE)
 
+    # 이름 접두어 일치(0점)와 동의어 접두어 일치(1점)는 정렬된 인덱스에서 찾음
     scored: List[tuple[int, Chemical]] = []
-    for chem in items:
-        name_l = chem.name.lower()
-        syns_l = [s.lower() for s in chem.synonyms]
-        score = None
-        if name_l.startswith(q):
-            score = 0
-        elif any(s.startswith(q) for s in syns_l):
-            score = 1
-        elif q in name_l:
-            score = 2
-        elif any(q in s for s in syns_l):
-            score = 3
-        if score is not None:
-            scored.append((score, chem))
-
-    scored.sort(key=lambda t: (t[0], t[1].name))
+    seen = set()
+    for chem in _prefix_run(cache["name_keys"], cache["name_items"], q):
+        scored.append((0, chem))
+        seen.add(id(chem))
+    for chem in _prefix_run(cache["syn_keys"], cache["syn_items"], q):
+        if id(chem) not in seen:
+            scored.append((1, chem))
+            seen.add(id(chem))
+
+    # 접두어 일치로 limit을 채우지 못할 때만 부분 문자열 검색.
+    # str.find가 이어 붙인 blob을 C에서 훑고, Python 코드는 일치한 항목마다 한 번만 실행.
+    # 점수(2 = 이름, 3 = 동의어)는 일치한 항목마다 결정.
+    # (검색어에 구분자가 있으면 항목 경계를 넘어 일치할 수 있으므로 건너뜀)
+    if len(scored) < limit and "\0" not in q and "\x01" not in q:
+        blob = cache["blob"]
+        starts = cache["blob_starts"]
+        pos = blob.find(q)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            chem = items[i]
+            if id(chem) not in seen:
+                scored.append((2 if q in chem.name_l else 3, chem))
+            if i + 1 >= len(starts):
+                break
+            pos = blob.find(q, starts[i + 1])  # 항목마다 최대 한 번
+
+    # 상위 limit개만: 후보 전체를 정렬하지 않고 O(N log limit)
+    top = heapq.nsmallest(limit, scored, key=lambda t: (t[0], t[1].name))
     results = []
-    for _, chem in scored[:limit]:
+    for _, chem in top:
         results.append(
             {
                 "name": chem.name,
@@ -5,27 +5,41 @@ Simplified version for high school project - easy to understand and maintain.
 from __future__ import annotations
 
 import asyncio
+import codecs
 import csv
 import io
-import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+import unicodedata
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, BinaryIO, Callable, Collection, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote
 
 import httpx
+import orjson
 from fastapi import FastAPI, HTTPException, Query, status, UploadFile, File
-from fastapi.responses import RedirectResponse, FileResponse, Response
+from fastapi.responses import RedirectResponse, FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from . import schemas, csvdb, localdb
 from .localdb import search_local
-from .utils import slugify
-import re
+from .utils import TTLCache, slugify
 try:
     from openpyxl import Workbook
 except Exception:  # pragma: no cover
     Workbook = None
+try:
+    from .scale_reader import ScaleReader, detect_scales
+except Exception:  # pragma: no cover - pyserial이 없어도 저울 외 기능은 동작하도록
+    ScaleReader = detect_scales = None
+try:
+    import h2  # noqa: F401  # httpx의 HTTP/2 지원은 h2 패키지가 있어야 동작
+    _HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover
+    _HTTP2_AVAILABLE = False
 
 PUBCHEM_AUTOCOMPLETE_URL = (
     "https://pubchem.ncbi.nlm.nih.gov/rest/autocomplete/compound/name/{query}/json"
@@ -34,8 +48,47 @@ PUBCHEM_PROPERTY_URL = (
     "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{name}/property/"
     "MolecularFormula,CID/JSON"
 )
+# 같은 검색어/화합물은 자주 반복되므로 PubChem 응답을 1시간 동안 재사용
+_PUBCHEM_NAMES_CACHE = TTLCache(maxsize=2048, ttl=3600)  # (query_lower, limit) -> names
+_PUBCHEM_PROPS_CACHE = TTLCache(maxsize=2048, ttl=3600)  # name_lower -> (formula, cid)
+# 진행 중인 PubChem 요청 (같은 검색어가 동시에 들어오면 요청 하나로 합침)
+_PUBCHEM_INFLIGHT: Dict[Tuple[Any, ...], "asyncio.Task[Any]"] = {}
+# DISABLE_PUBCHEM=1이면 자동완성은 로컬 DB만 사용 (오프라인 환경 등)
+PUBCHEM_ENABLED = os.environ.get("DISABLE_PUBCHEM", "0") != "1"
+# 앱 전체에서 동시에 보내는 PubChem 요청 수 (PubChem 요청 제한: 초당 5회)
+_PUBCHEM_CONCURRENCY = 5
+# 자동완성은 기다려 줄 수 있는 시간이 짧으므로 클라이언트 기본값(5초)보다 짧게
+_PUBCHEM_TIMEOUT = httpx.Timeout(3.0, connect=2.0)
+
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # PubChem 호출용 HTTP 클라이언트는 앱 전체에서 하나만 만들어 연결(TLS)을 재사용
+    # h2가 설치되어 있으면 HTTP/2로 병렬 속성 조회를 한 연결에 다중화
+    app.state.http = httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        timeout=5.0,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    )
+    # 모든 요청이 공유하는 PubChem 동시 요청 제한
+    app.state.pubchem_limit = asyncio.Semaphore(_PUBCHEM_CONCURRENCY)
+    try:
+        yield
+    finally:
+        try:
+            await app.state.http.aclose()
+        finally:
+            close_scale_file()
 
-app = FastAPI(title="Reagent-ology API (CSV)", version="0.2.0")
+
+# orjson으로 JSON 응답 직렬화 (표준 json보다 빠름)
+app = FastAPI(
+    title="Reagent-ology API (CSV)",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,8 +98,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(csvdb.StorageError)
+async def storage_error_handler(request, exc: csvdb.StorageError) -> ORJSONResponse:
+    """reagents.csv 저장이 실패하고 있는 동안의 변경 요청은 503으로 알림"""
+    return ORJSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)})
+
 # --- Static files (serve UI over HTTP so phones can access via LAN IP/mDNS) ---
-import os
 from pathlib import Path
 
 _here = Path(__file__).resolve().parent
@@ -111,32 +169,28 @@ def legacy_typo_redirect():
 
 
 # Single health endpoint
-@app.get("/api/health")
-def health() -> Dict[str, str]:
+_HEALTH_TS: Tuple[int, str] = (0, "")
+
+
+@app.get("/api/health", response_class=ORJSONResponse)
+def health() -> ORJSONResponse:
     """Lightweight health check for launcher/browser readiness."""
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "storage": "CSV"}
+    global _HEALTH_TS
+    sec = int(time.time())
+    if sec != _HEALTH_TS[0]:
+        # Polled frequently: format the timestamp at most once per second
+        stamp = datetime.fromtimestamp(sec, timezone.utc).replace(tzinfo=None).isoformat()
+        _HEALTH_TS = (sec, stamp)
+    error = csvdb.storage_error()
+    if error:
+        # Stay 200: run_app.py treats a failing health check as a dead server and kills it
+        return ORJSONResponse({"status": "degraded", "timestamp": _HEALTH_TS[1], "storage": "CSV", "error": error})
+    return ORJSONResponse({"status": "ok", "timestamp": _HEALTH_TS[1], "storage": "CSV"})
 
 
 def ensure_unique_slug(base: str, current_id: Optional[int] = None) -> str:
     """Generate unique slug"""
-    slug = base or "reagent"
-    candidate = slug
-    suffix = 1
-    
-    all_reagents = csvdb.list_all_reagents()
-    
-    while True:
-        conflict = False
-        for r in all_reagents:
-            if r["slug"] == candidate and (current_id is None or r["id"] != current_id):
-                conflict = True
-                break
-        
-        if not conflict:
-            return candidate
-        
-        candidate = f"{slug}-{suffix}"
-        suffix += 1
+    return csvdb.unique_slug(base or "reagent", current_id=current_id)
 
 
 def normalize_optional_string(value: Optional[str]) -> Optional[str]:
@@ -146,73 +200,161 @@ def normalize_optional_string(value: Optional[str]) -> Optional[str]:
     return normalized or None
 
 
-def normalize_nfc_tag(value: Optional[str]) -> Optional[str]:
-    """Normalize NFC UID by removing separators and uppercasing.
-    Examples:
-    '04:E4:B4:C2:43:20:90' -> '04E4B4C2432090'
-    '04e4b4c2432090' -> '04E4B4C2432090'
-    Returns None if input is falsy after stripping.
+def canonical_query(query: str) -> str:
+    """검색어 정규화 (NFKC, 소문자, 연속 공백 하나로): 'Ethanol ', 'ＥＴＨＡＮＯＬ'이 같은 캐시/인덱스 키가 되도록
+
+    로컬 인덱스가 lower() 기준이라 casefold 대신 lower 사용
     """
-    if value is None:
-        return None
-    s = value.strip()
-    if not s:
-        return None
-    # keep hex digits only
-    s = re.sub(r"[^0-9A-Fa-f]", "", s)
-    return s.upper() or None
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
 
 
-async def fetch_pubchem_suggestions(query: str, limit: int = 8) -> List[Dict[str, Optional[str]]]:
-    if not query:
-        return []
-    async with httpx.AsyncClient(timeout=5.0) as client:
+def pubchem_eligible(query: str) -> bool:
+    """PubChem 자동완성으로 찾을 수 있는 검색어인지 (영문 이름만, 너무 짧으면 의미 없음)"""
+    q = query.strip()
+    return len(q) >= 3 and q.isascii()
+
+
+async def _single_flight(key: Tuple[Any, ...], request: Callable[[], Awaitable[Any]]) -> Any:
+    """같은 key의 PubChem 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 함께 기다림
+
+    기다리던 쪽이 취소돼도 요청 자체는 끝까지 진행되어 캐시를 채움 (shield)
+    """
+    loop = asyncio.get_running_loop()
+    task = _PUBCHEM_INFLIGHT.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(request())
+        _PUBCHEM_INFLIGHT[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            if _PUBCHEM_INFLIGHT.get(key) is t:
+                del _PUBCHEM_INFLIGHT[key]
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
+async def _fetch_pubchem_properties(
+    client: httpx.AsyncClient, name: str
+) -> Tuple[Optional[str], Optional[int]]:
+    """화합물 이름 -> (MolecularFormula, CID). 확정된 응답(200/404)만 캐시"""
+    key = name.lower()
+    cached = _PUBCHEM_PROPS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return await _single_flight(("props", key), lambda: _request_pubchem_properties(client, name, key))
+
+
+async def _request_pubchem_properties(
+    client: httpx.AsyncClient, name: str, key: str
+) -> Tuple[Optional[str], Optional[int]]:
+    async with app.state.pubchem_limit:
+        response = await client.get(PUBCHEM_PROPERTY_URL.format(name=quote(name)), timeout=_PUBCHEM_TIMEOUT)
+    formula: Optional[str] = None
+    cid: Optional[int] = None
+    if response.status_code == 200:
         try:
+            payload = orjson.loads(response.content)
+            props = payload.get("PropertyTable", {}).get("Properties", [])
+            if props:
+                record = props[0]
+                formula = record.get("MolecularFormula")
+                cid = record.get("CID")
+        except (ValueError, AttributeError):  # orjson.JSONDecodeError는 ValueError
+            formula = None
+    if response.status_code in (200, 404):
+        _PUBCHEM_PROPS_CACHE.set(key, (formula, cid))
+    return formula, cid
+
+
+async def _fetch_pubchem_names(
+    client: httpx.AsyncClient, query: str, limit: int
+) -> List[str]:
+    """PubChem 자동완성 이름 후보 최대 limit개 (성공한 응답만 캐시, 실패하면 빈 목록)"""
+    key = (query.lower(), limit)
+    names = _PUBCHEM_NAMES_CACHE.get(key)
+    if names is not None:
+        return names
+    return await _single_flight(("names", key), lambda: _request_pubchem_names(client, query, limit, key))
+
+
+async def _request_pubchem_names(
+    client: httpx.AsyncClient, query: str, limit: int, key: Tuple[str, int]
+) -> List[str]:
+    try:
+        async with app.state.pubchem_limit:
             response = await client.get(
                 PUBCHEM_AUTOCOMPLETE_URL.format(query=quote(query)),
                 params={"limit": limit},
+                timeout=_PUBCHEM_TIMEOUT,
             )
-            response.raise_for_status()
-        except httpx.HTTPError:
-            return []
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return []
 
-        data = response.json()
+    try:
+        data = orjson.loads(response.content)
         names = data.get("dictionary_terms", {}).get("compound", [])[:limit]
-        if not names:
-            return []
+    except (ValueError, AttributeError):
+        return []
+    _PUBCHEM_NAMES_CACHE.set(key, names)
+    return names
 
-        tasks = [
-            client.get(PUBCHEM_PROPERTY_URL.format(name=quote(name)))
-            for name in names
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        suggestions: List[Dict[str, Optional[str]]] = []
-        for name, result in zip(names, results):
-            formula: Optional[str] = None
-            cid: Optional[int] = None
-            if isinstance(result, httpx.Response) and result.status_code == 200:
-                try:
-                    payload = result.json()
-                    props = payload.get("PropertyTable", {}).get("Properties", [])
-                    if props:
-                        record = props[0]
-                        formula = record.get("MolecularFormula")
-                        cid = record.get("CID")
-                except (ValueError, json.JSONDecodeError):
-                    formula = None
-            suggestions.append({"name": name, "formula": formula, "cid": cid})
-        return suggestions
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """기다리지 않고 버릴 수 있는 작업의 예외를 꺼내 둠 ("Task exception was never retrieved" 경고 방지)"""
+    if not task.cancelled():
+        task.exception()
+
+
+async def fetch_pubchem_suggestions(
+    client: httpx.AsyncClient,
+    query: str,
+    limit: int = 8,
+    needed: Optional[int] = None,
+    exclude: Optional[Collection[str]] = None,
+    names: Optional[List[str]] = None,
+) -> List[Dict[str, Optional[str]]]:
+    """PubChem 자동완성 후보 limit개 중, exclude에 없는 이름을 needed개까지만 물성 조회해서 반환
+
+    names를 넘기면 (미리 받아둔 이름 후보) 자동완성 요청은 생략
+    """
+    if not query:
+        return []
+    if names is None:
+        names = await _fetch_pubchem_names(client, query, limit)
+
+    # 이미 가진 이름과 중복은 건너뛰고, 필요한 개수만큼만 물성 요청을 보냄
+    skip = set(exclude or ())
+    picked: List[str] = []
+    for name in names:
+        if not name or name in skip:
+            continue
+        picked.append(name)
+        skip.add(name)
+        if needed is not None and len(picked) >= needed:
+            break
+    names = picked
+    if not names:
+        return []
+
+    results = await asyncio.gather(
+        *(_fetch_pubchem_properties(client, name) for name in names), return_exceptions=True
+    )
+
+    suggestions: List[Dict[str, Optional[str]]] = []
+    for name, result in zip(names, results):
+        formula, cid = result if isinstance(result, tuple) else (None, None)
+        suggestions.append({"name": name, "formula": formula, "cid": cid})
+    return suggestions
 
 
 ## Removed duplicate health endpoint (merged above)
 
 
 @app.get("/api/reagents", response_model=List[schemas.ReagentOut])
-def list_reagents() -> List[schemas.ReagentOut]:
-    """모든 시약 목록"""
-    reagents = csvdb.list_all_reagents()
-    return [schemas.ReagentOut(**r) for r in reagents]
+def list_reagents() -> List[Dict[str, Any]]:
+    """모든 시약 목록 (response_model이 검증/직렬화하므로 dict를 그대로 반환)"""
+    return csvdb.list_all_reagents()
 
 
 # 주의: /api/reagents/{slug} 라우트와 충돌할 수 있어 별도 prefix(/api/export)를 사용
@@ -263,21 +405,15 @@ def export_reagents_xlsx() -> Response:
 
 
 @app.get("/api/reagents/by-nfc/{tag}", response_model=schemas.ReagentOut)
-def get_reagent_by_nfc(tag: str) -> schemas.ReagentOut:
-    """NFC 태그 UID로 시약 조회"""
-    if tag is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tag is required")
+def get_reagent_by_nfc(tag: str) -> Dict[str, Any]:
+    """NFC 태그 UID로 시약 조회 (경로 파라미터라 None일 수 없음, 공백만 있는 경우만 거름)"""
     cleaned = tag.strip()
     if not cleaned:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tag is empty")
-    norm_in = normalize_nfc_tag(cleaned)
-    for r in csvdb.list_all_reagents():
-        stored = r.get("nfc_tag_uid") or ""
-        if stored.strip() == cleaned:
-            return schemas.ReagentOut(**r)
-        if normalize_nfc_tag(stored) == norm_in and norm_in:
-            return schemas.ReagentOut(**r)
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reagent not found for provided NFC tag")
+    r = csvdb.get_reagent_by_nfc(cleaned)
+    if r is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reagent not found for provided NFC tag")
+    return r
 
 
 @app.post(
@@ -285,7 +421,7 @@ def get_reagent_by_nfc(tag: str) -> schemas.ReagentOut:
     response_model=schemas.ReagentOut,
     status_code=status.HTTP_201_CREATED,
 )
-def create_reagent(payload: schemas.ReagentCreate) -> schemas.ReagentOut:
+def create_reagent(payload: schemas.ReagentCreate) -> Dict[str, Any]:
     """새 시약 등록"""
     base_slug = slugify(payload.name, payload.cas)
     slug = ensure_unique_slug(base_slug)
@@ -316,50 +452,38 @@ def create_reagent(payload: schemas.ReagentCreate) -> schemas.ReagentOut:
     }
 
     reagent = csvdb.create_reagent(data)
-    return schemas.ReagentOut(**reagent)
+    return reagent
 
 
 @app.get("/api/reagents/{identifier}", response_model=schemas.ReagentOut)
-def get_reagent(identifier: str) -> schemas.ReagentOut:
-    """시약 상세 조회"""
+def get_reagent(identifier: str) -> Dict[str, Any]:
+    """시약 상세 조회 (목록과 같이 response_model이 검증/직렬화)"""
     reagent = csvdb.get_reagent(identifier)
     if not reagent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reagent not found")
-    return schemas.ReagentOut(**reagent)
+    return reagent
+
+
+# 수정 요청에서 값을 그대로 옮기는 필드
+_SIMPLE_UPDATE_FIELDS = {
+    "name", "formula", "cas", "location", "storage", "state", "hazard", "ghs", "disposal", "used", "discarded",
+}
 
 
 @app.put("/api/reagents/{identifier}", response_model=schemas.ReagentOut)
 def update_reagent(
     identifier: str,
     payload: schemas.ReagentUpdate,
-) -> schemas.ReagentOut:
+) -> Dict[str, Any]:
     """시약 정보 수정"""
     reagent = csvdb.get_reagent(identifier)
     if not reagent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reagent not found")
 
-    update_data = {}
-    
-    if payload.name is not None:
-        update_data["name"] = payload.name
-    if payload.formula is not None:
-        update_data["formula"] = payload.formula
-    if payload.cas is not None:
-        update_data["cas"] = payload.cas
-    if payload.location is not None:
-        update_data["location"] = payload.location
-    if payload.storage is not None:
-        update_data["storage"] = payload.storage
-    if payload.state is not None:
-        update_data["state"] = payload.state
+    # 값을 그대로 옮기는 필드 (None이면 변경 안 함), 나머지는 아래에서 따로 처리
+    update_data = payload.model_dump(include=_SIMPLE_UPDATE_FIELDS, exclude_none=True)
     if payload.expiry is not None:
-        update_data["expiry"] = payload.expiry.isoformat() if payload.expiry else None
-    if payload.hazard is not None:
-        update_data["hazard"] = payload.hazard
-    if payload.ghs is not None:
-        update_data["ghs"] = payload.ghs
-    if payload.disposal is not None:
-        update_data["disposal"] = payload.disposal
+        update_data["expiry"] = payload.expiry.isoformat()
     
     # 밀도 업데이트 시 부피 재계산 (액체에 한함)
     if payload.density is not None:
@@ -383,11 +507,6 @@ def update_reagent(
         effective_state = payload.state if payload.state is not None else reagent.get("state")
         if reagent["density"] and effective_state == 'liquid':
             update_data["volume_ml"] = payload.quantity / reagent["density"]
-    
-    if payload.used is not None:
-        update_data["used"] = payload.used
-    if payload.discarded is not None:
-        update_data["discarded"] = payload.discarded
 
     # slug 업데이트 체크
     if payload.name is not None or payload.cas is not None:
@@ -401,7 +520,7 @@ def update_reagent(
     if not updated:
         raise HTTPException(status_code=500, detail="Update failed")
     
-    return schemas.ReagentOut(**updated)
+    return updated
 
 
 @app.delete(
@@ -421,7 +540,7 @@ def delete_reagent(identifier: str) -> Response:
 def use_reagent(
     identifier: str,
     payload: schemas.UseRequest,
-) -> schemas.ReagentOut:
+) -> Dict[str, Any]:
     """시약 사용"""
     reagent = csvdb.get_reagent(identifier)
     if not reagent:
@@ -430,20 +549,9 @@ def use_reagent(
     if reagent["quantity"] < payload.amount:
         raise HTTPException(status_code=400, detail="Insufficient quantity")
     
-    prev = reagent["quantity"]
     new_qty = max(0.0, reagent["quantity"] - payload.amount)
     
-    # 사용량 기록
-    csvdb.add_usage_log(
-        reagent_id=reagent["id"],
-        prev_qty=prev,
-        new_qty=new_qty,
-        delta=-payload.amount,
-        source="use",
-        note=payload.note,
-    )
-    
-    # 시약 정보 업데이트
+    # 시약 정보 업데이트 (저장되면 사용량 기록도 함께 추가)
     update_data = {
         "quantity": new_qty,
         "used": reagent["used"] + payload.amount,
@@ -453,15 +561,17 @@ def use_reagent(
     if reagent.get("state") == 'liquid' and reagent["density"]:
         update_data["volume_ml"] = new_qty / reagent["density"]
     
-    updated = csvdb.update_reagent(identifier, update_data)
-    return schemas.ReagentOut(**updated)
+    updated = csvdb.update_reagent_with_log(
+        identifier, update_data, source="use", note=payload.note, delta=-payload.amount,
+    )
+    return updated
 
 
 @app.post("/api/reagents/{identifier}/discard", response_model=schemas.ReagentOut)
 def discard_reagent(
     identifier: str,
     payload: schemas.UseRequest,
-) -> schemas.ReagentOut:
+) -> Dict[str, Any]:
     """시약 폐기"""
     reagent = csvdb.get_reagent(identifier)
     if not reagent:
@@ -470,20 +580,9 @@ def discard_reagent(
     if reagent["quantity"] < payload.amount:
         raise HTTPException(status_code=400, detail="Insufficient quantity")
     
-    prev = reagent["quantity"]
     new_qty = max(0.0, reagent["quantity"] - payload.amount)
     
-    # 폐기량 기록
-    csvdb.add_usage_log(
-        reagent_id=reagent["id"],
-        prev_qty=prev,
-        new_qty=new_qty,
-        delta=-payload.amount,
-        source="discard",
-        note=payload.note,
-    )
-    
-    # 시약 정보 업데이트
+    # 시약 정보 업데이트 (저장되면 폐기량 기록도 함께 추가)
     update_data = {
         "quantity": new_qty,
         "discarded": reagent["discarded"] + payload.amount,
@@ -493,15 +592,17 @@ def discard_reagent(
     if reagent.get("state") == 'liquid' and reagent["density"]:
         update_data["volume_ml"] = new_qty / reagent["density"]
     
-    updated = csvdb.update_reagent(identifier, update_data)
-    return schemas.ReagentOut(**updated)
+    updated = csvdb.update_reagent_with_log(
+        identifier, update_data, source="discard", note=payload.note, delta=-payload.amount,
+    )
+    return updated
 
 
 @app.post("/api/reagents/{identifier}/measurement", response_model=schemas.ReagentOut)
 def update_measurement(
     identifier: str,
     payload: schemas.MeasurementRequest,
-) -> schemas.ReagentOut:
+) -> Dict[str, Any]:
     """저울 측정값 업데이트"""
     reagent = csvdb.get_reagent(identifier)
     if not reagent:
@@ -518,8 +619,6 @@ def update_measurement(
             detail="Provide measured_mass or measured_volume",
         )
     
-    prev_mass = reagent["quantity"] or 0.0
-    
     # 질량/부피 계산
     if mass is None and volume is not None:
         if reagent["density"]:
@@ -531,32 +630,20 @@ def update_measurement(
         if reagent.get("state") == 'liquid' and reagent["density"]:
             volume = mass / reagent["density"]
     
-    delta = (mass or 0.0) - prev_mass
-    
-    # 사용 기록 추가
-    csvdb.add_usage_log(
-        reagent_id=reagent["id"],
-        prev_qty=prev_mass,
-        new_qty=mass or 0.0,
-        delta=delta,
-        source=payload.source,
-        note=payload.note,
-    )
-    
-    # 시약 정보 업데이트
+    # 시약 정보 업데이트 (저장되면 이전 양 → 측정값 변화를 사용 기록으로 추가)
     update_data = {
         "quantity": mass,
         "volume_ml": volume,
     }
     
-    updated = csvdb.update_reagent(identifier, update_data)
-    return schemas.ReagentOut(**updated)
+    updated = csvdb.update_reagent_with_log(identifier, update_data, source=payload.source, note=payload.note)
+    return updated
 
 
 @app.post("/api/measurements/weight", response_model=schemas.ReagentOut)
 def record_weight_measurement(
     payload: schemas.WeightMeasurementRequest,
-) -> schemas.ReagentOut:
+) -> Dict[str, Any]:
     """NFC 태그로 시약 찾아서 저울 측정값 기록"""
     tag = payload.nfc_tag_uid.strip()
     if not tag:
@@ -565,67 +652,30 @@ def record_weight_measurement(
             detail="NFC tag UID cannot be empty",
         )
     
-    # NFC 태그로 시약 찾기
-    all_reagents = csvdb.list_all_reagents()
-    reagent = None
-    norm_in = normalize_nfc_tag(tag)
-    for r in all_reagents:
-        stored = r.get("nfc_tag_uid") or ""
-        if stored == tag:
-            reagent = r
-            break
-        if norm_in and normalize_nfc_tag(stored) == norm_in:
-            reagent = r
-            break
-    
-    if not reagent:
+    # 시약 조회, 사용 기록, 양/부피 갱신을 한 번의 쓰기 잠금 안에서 처리
+    updated = csvdb.record_weight_by_nfc(tag, payload.measured_mass, payload.source, payload.note)
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reagent not found for provided NFC tag",
         )
-    
-    # 측정값 업데이트
-    prev_mass = reagent["quantity"] or 0.0
-    mass = payload.measured_mass
-    volume = None
-    
-    if reagent.get("state") == 'liquid' and reagent["density"]:
-        volume = mass / reagent["density"]
-    
-    delta = mass - prev_mass
-    
-    # 사용 기록 추가
-    csvdb.add_usage_log(
-        reagent_id=reagent["id"],
-        prev_qty=prev_mass,
-        new_qty=mass,
-        delta=delta,
-        source=payload.source,
-        note=payload.note,
-    )
-    
-    # 시약 정보 업데이트
-    update_data = {
-        "quantity": mass,
-        "volume_ml": volume,
-    }
-    
-    updated = csvdb.update_reagent(str(reagent["id"]), update_data)
-    return schemas.ReagentOut(**updated)
+    return updated
 
 
 @app.get(
     "/api/reagents/{identifier}/usage",
     response_model=List[schemas.UsageLogOut],
 )
-def list_usage(identifier: str) -> List[schemas.UsageLogOut]:
-    """시약 사용 이력 조회"""
-    reagent = csvdb.get_reagent(identifier)
-    if not reagent:
+def list_usage(
+    identifier: str,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="최근 기록 개수 제한"),
+    before: Optional[int] = Query(None, ge=1, description="이 기록 ID보다 이전 기록만 (페이지 넘김용)"),
+) -> List[Dict[str, Any]]:
+    """시약 사용 이력 조회 (최신순, response_model이 검증/직렬화하므로 dict를 그대로 반환)"""
+    logs = csvdb.get_reagent_usage(identifier, limit=limit, before=before)
+    if logs is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reagent not found")
-    
-    logs = csvdb.get_usage_logs(reagent["id"])
-    return [schemas.UsageLogOut(**log) for log in logs]
+    return logs
 
 
 @app.post("/api/reagents/reset-stats")
@@ -644,25 +694,47 @@ async def autocomplete(
     limit: int = Query(8, ge=1, le=20),
 ) -> schemas.AutocompleteResponse:
     """자동완성: 로컬 CSV 우선, 부족하면 PubChem"""
-    # 1) 로컬 우선
-    local = search_local(q, limit=limit)
-    seen = {item["name"] for item in local}
-    results: List[Dict[str, Optional[str]]] = list(local)
+    q = canonical_query(q)
+    if not q:
+        return schemas.AutocompleteResponse(suggestions=[])
+    # PubChem 이름 후보 요청은 로컬 검색과 동시에 시작 (캐시에 없을 때만, PubChem이 찾을 수 없는 검색어는 생략)
+    remote_limit = limit * 2
+    use_pubchem = PUBCHEM_ENABLED and pubchem_eligible(q)
+    names_task: Optional[asyncio.Task] = None
+    if use_pubchem and _PUBCHEM_NAMES_CACHE.get((q.lower(), remote_limit)) is None:
+        names_task = asyncio.create_task(_fetch_pubchem_names(app.state.http, q, remote_limit))
+        names_task.add_done_callback(_retrieve_exception)  # 취소되거나 기다리지 않고 끝나도 예외 경고가 남지 않도록
+
+    # 1) 로컬 우선 (파일을 읽을 수 있으므로 이벤트 루프를 막지 않게 스레드에서 실행)
+    try:
+        local = await asyncio.to_thread(search_local, q, limit=limit)
+    except BaseException:
+        if names_task is not None:
+            names_task.cancel()
+        raise
+    # 이름 -> 제안 (삽입 순서 유지, 중복 제거를 한 구조로)
+    merged: Dict[str, Dict[str, Optional[str]]] = {item["name"]: item for item in local}
 
     # 2) 부족하면 PubChem으로 보강
-    remaining = max(0, limit - len(results))
-    if remaining > 0:
-        remote = await fetch_pubchem_suggestions(q, limit=limit * 2)
+    # 단, 검색어와 정확히 같은 이름이 로컬에 있고 후보도 충분하면 찾던 시약을 이미 찾은 것이므로 생략
+    remaining = max(0, limit - len(merged))
+    if remaining and len(merged) >= max(3, limit // 2) and any(name.lower() == q for name in merged):
+        remaining = 0
+    if remaining == 0 and names_task is not None:
+        names_task.cancel()  # 로컬만으로 충분하면 PubChem 응답은 기다리지 않음
+    if remaining > 0 and use_pubchem:
+        remote = await fetch_pubchem_suggestions(
+            app.state.http, q, limit=remote_limit, needed=remaining, exclude=merged.keys(),
+            names=await names_task if names_task is not None else None,
+        )
         for item in remote:
             name = item.get("name")
-            if not name or name in seen:
-                continue
-            results.append(item)
-            seen.add(name)
-            if len(results) >= limit:
-                break
+            if name:
+                merged.setdefault(name, item)
+                if len(merged) >= limit:
+                    break
 
-    return schemas.AutocompleteResponse(suggestions=results)
+    return schemas.AutocompleteResponse(suggestions=list(merged.values()))
 
 
 @app.get(
@@ -674,14 +746,16 @@ async def autocomplete_local(
     limit: int = Query(8, ge=1, le=50),
 ) -> schemas.AutocompleteResponse:
     """로컬 CSV만 검색"""
-    return schemas.AutocompleteResponse(suggestions=search_local(q, limit=limit))
+    q = canonical_query(q)
+    local = await asyncio.to_thread(search_local, q, limit=limit)
+    return schemas.AutocompleteResponse(suggestions=local)
 
 
 # Local autocomplete DB CRUD endpoints
 @app.get("/api/autocomplete/local-db", response_model=List[schemas.LocalChemOut])
-def list_local_db() -> List[schemas.LocalChemOut]:
+def list_local_db() -> List[Dict[str, Any]]:
     """자동완성 DB 전체 목록"""
-    return [schemas.LocalChemOut(**item) for item in localdb.list_all()]
+    return localdb.list_all()
 
 
 @app.post("/api/autocomplete/local-db", response_model=schemas.LocalChemOut, status_code=201)
@@ -705,6 +779,24 @@ def add_local_db(payload: schemas.LocalChemCreate) -> schemas.LocalChemOut:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/autocomplete/local-db/bulk", response_model=List[schemas.LocalChemOut], status_code=201)
+def bulk_add_local_db(payload: schemas.LocalChemBulkCreate) -> List[schemas.LocalChemOut]:
+    """자동완성 DB 항목 여러 개를 한 번에 추가 (파일은 한 번만 저장, 하나라도 실패하면 전체 취소)"""
+    try:
+        items = localdb.bulk_add_items([item.model_dump() for item in payload.items])
+    except FileExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [schemas.LocalChemOut(**item) for item in items]
+
+
+@app.post("/api/autocomplete/local-db/bulk-delete", response_model=schemas.LocalChemBulkDeleteOut)
+def bulk_delete_local_db(payload: schemas.LocalChemBulkDelete) -> schemas.LocalChemBulkDeleteOut:
+    """자동완성 DB 항목 여러 개를 한 번에 삭제 (없는 이름은 무시)"""
+    return schemas.LocalChemBulkDeleteOut(deleted=localdb.bulk_delete_items(payload.names))
+
+
 @app.delete("/api/autocomplete/local-db/{name}", status_code=204, response_class=Response)
 def delete_local_db(name: str) -> Response:
     """자동완성 DB 항목 삭제"""
@@ -742,31 +834,20 @@ def list_locations(
     q: Optional[str] = Query(None, min_length=1, max_length=60),
 ) -> List[str]:
     """등록된 시약의 location 목록 (자동완성용)"""
-    all_reagents = csvdb.list_all_reagents()
-    locations = set()
-    
-    for r in all_reagents:
-        loc = r.get("location")
-        if loc and isinstance(loc, str):
-            loc = loc.strip()
-            if loc:
-                locations.add(loc)
-    
-    # 쿼리가 있으면 필터링
-    if q:
-        q_lower = q.lower()
-        locations = {loc for loc in locations if q_lower in loc.lower()}
-    
-    # 알파벳 순 정렬
-    return sorted(locations)
+    return csvdb.list_locations(q)
 
 
 # ============= Scale Integration Endpoints =============
 
+def _require_scale_reader() -> None:
+    if ScaleReader is None:
+        raise HTTPException(status_code=500, detail="pyserial이 설치되어 있지 않습니다. requirements.txt의 pyserial을 설치하세요.")
+
+
 @app.get("/api/scale/ports")
 def list_scale_ports():
     """사용 가능한 시리얼 포트 목록 조회"""
-    from .scale_reader import detect_scales
+    _require_scale_reader()
     
     try:
         ports = detect_scales()
@@ -778,14 +859,8 @@ def list_scale_ports():
         )
 
 
-@app.get("/api/scale/weight")
-def read_scale_weight(
-    port: Optional[str] = Query(None, description="Serial port name"),
-    baudrate: int = Query(9600, description="Baudrate for serial communication"),
-):
-    """저울에서 현재 무게 읽기 (3초 안정화)"""
-    from .scale_reader import ScaleReader
-    
+def _read_stable_weight(port: Optional[str], baudrate: int) -> Tuple[float, Optional[str]]:
+    """저울에 연결해 안정된 무게를 읽고 연결 해제 (블로킹, 최대 수 초) -> (무게, 포트)"""
     try:
         scale = ScaleReader(port=port, baudrate=baudrate)
         if not scale.connect():
@@ -802,12 +877,7 @@ def read_scale_weight(
                     status_code=503,
                     detail="Could not get stable weight reading (waited for 3 seconds stability)"
                 )
-            
-            return {
-                "weight_grams": weight,
-                "port": scale.port,
-                "timestamp": datetime.now().isoformat()
-            }
+            return weight, scale.port
         finally:
             scale.disconnect()
             
@@ -820,23 +890,8 @@ def read_scale_weight(
         )
 
 
-@app.post("/api/reagents/{reagent_id}/measure-weight")
-def update_reagent_weight_from_scale(
-    reagent_id: int,
-    port: Optional[str] = Query(None, description="Serial port name"),
-    baudrate: int = Query(9600, description="Baudrate"),
-    note: Optional[str] = Query(None, description="Optional note"),
-):
-    """저울에서 무게를 읽어 시약의 quantity 업데이트 (3초 안정화)"""
-    from .scale_reader import ScaleReader
-    
-    # 시약 조회
-    # csvdb.get_reagent은 문자열 identifier를 받아 숫자도 처리합니다.
-    reagent = csvdb.get_reagent(str(reagent_id))
-    if not reagent:
-        raise HTTPException(status_code=404, detail="Reagent not found")
-    
-    # 저울에서 무게 읽기
+def _tare(port: Optional[str], baudrate: int) -> None:
+    """저울에 연결해 영점 조정 명령을 보내고 연결 해제 (블로킹)"""
     try:
         scale = ScaleReader(port=port, baudrate=baudrate)
         if not scale.connect():
@@ -846,12 +901,10 @@ def update_reagent_weight_from_scale(
             )
         
         try:
-            # 3초 동안 무게가 안정될 때까지 대기
-            weight = scale.get_stable_weight(max_attempts=30, tolerance=0.1, stable_duration=3.0)
-            if weight is None:
+            if not scale.tare():
                 raise HTTPException(
-                    status_code=503,
-                    detail="Could not get stable weight reading (waited for 3 seconds stability)"
+                    status_code=500,
+                    detail="Failed to send tare command"
                 )
         finally:
             scale.disconnect()
@@ -861,31 +914,60 @@ def update_reagent_weight_from_scale(
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error reading scale: {str(e)}"
+            detail=f"Error taring scale: {str(e)}"
         )
+
+
+# 저울 입출력은 최대 몇 초씩 걸리므로 스레드에서 실행하고 이벤트 루프는 다른 요청을 처리
+@app.get("/api/scale/weight")
+async def read_scale_weight(
+    port: Optional[str] = Query(None, description="Serial port name"),
+    baudrate: int = Query(9600, description="Baudrate for serial communication"),
+):
+    """저울에서 현재 무게 읽기 (3초 안정화)"""
+    _require_scale_reader()
+    weight, used_port = await asyncio.to_thread(_read_stable_weight, port, baudrate)
+    return {
+        "weight_grams": weight,
+        "port": used_port,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.post("/api/reagents/{reagent_id}/measure-weight")
+async def update_reagent_weight_from_scale(
+    reagent_id: int,
+    port: Optional[str] = Query(None, description="Serial port name"),
+    baudrate: int = Query(9600, description="Baudrate"),
+    note: Optional[str] = Query(None, description="Optional note"),
+):
+    """저울에서 무게를 읽어 시약의 quantity 업데이트 (3초 안정화)"""
+    _require_scale_reader()
+    
+    # 시약 조회
+    # csvdb.get_reagent은 문자열 identifier를 받아 숫자도 처리합니다.
+    reagent = await asyncio.to_thread(csvdb.get_reagent, str(reagent_id))
+    if not reagent:
+        raise HTTPException(status_code=404, detail="Reagent not found")
+    
+    # 저울에서 무게 읽기
+    weight, _ = await asyncio.to_thread(_read_stable_weight, port, baudrate)
     
     # 이전 수량 저장
     prev_qty = reagent["quantity"]
     
-    # 수량 업데이트
-    updated = csvdb.update_reagent(
+    # 수량 업데이트 (저장되면 사용 로그도 함께 기록)
+    delta = weight - prev_qty
+    updated = await asyncio.to_thread(
+        csvdb.update_reagent_with_log,
         str(reagent_id),
         {"quantity": weight},
-    )
-    
-    # 사용 로그 기록
-    delta = weight - prev_qty
-    csvdb.add_usage_log(
-        reagent_id=reagent_id,
-        prev_qty=prev_qty,
-        new_qty=weight,
-        delta=delta,
         source="scale",
         note=note or f"Weight measured from scale: {weight}g",
     )
     
     return {
-        "reagent": schemas.ReagentOut(**updated),
+        "reagent": updated,
         "measured_weight": weight,
         "previous_quantity": prev_qty,
         "delta": delta,
@@ -894,47 +976,174 @@ def update_reagent_weight_from_scale(
 
 
 @app.post("/api/scale/tare")
-def tare_scale(
+async def tare_scale(
     port: Optional[str] = Query(None, description="Serial port name"),
     baudrate: int = Query(9600, description="Baudrate"),
 ):
     """저울 영점 조정 (Tare)"""
-    from .scale_reader import ScaleReader
+    _require_scale_reader()
+    await asyncio.to_thread(_tare, port, baudrate)
+    return {
+        "success": True,
+        "message": "Scale tared successfully",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+# ============= Scale Measurement CSV Upload Endpoints =============
+
+def _apply_measurement_rows(rows: Iterator[List[str]]) -> Dict[str, Any]:
+    """업로드된 측정값 행들을 시약 수량/사용 기록에 반영하고 행별 결과를 모음
+
+    csvdb를 동기적으로 호출하므로 이벤트 루프가 아닌 스레드에서 실행
+    """
+    results = {
+        "total": 0,
+        "success": 0,
+        "failed": 0,
+        "errors": [],
+        "updates": []
+    }
+    pending_qty: Dict[int, float] = {}  # 시약 ID -> 반영할 측정값
+    logs: List[Dict[str, Any]] = []
     
-    try:
-        scale = ScaleReader(port=port, baudrate=baudrate)
-        if not scale.connect():
-            raise HTTPException(
-                status_code=503,
-                detail="Failed to connect to scale"
-            )
+    # 행마다 dict를 만들지 않도록 열 위치를 미리 구해둠 (없는 열은 항상 빈 문자열인 맨 끝 칸을 가리킴)
+    header = next(rows, [])
+    width = len(header)
+    col = {name: i for i, name in enumerate(header)}
+    i_weight, i_nfc, i_id, i_name, i_note, i_operator, i_timestamp = (
+        col.get(name, width) for name in (
+            'measured_weight', 'nfc_tag_uid', 'reagent_id', 'reagent_name', 'note', 'operator', 'timestamp',
+        )
+    )
+    pad = [''] * width
+    
+    for row_num, row in enumerate(filter(None, rows), start=2):  # 헤더 다음부터 (빈 줄은 건너뜀)
+        if len(row) != width:
+            del row[width:]
+            row += pad[len(row):]
+        row.append('')
+        results["total"] += 1
         
         try:
-            success = scale.tare()
-            if not success:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to send tare command"
+            # 측정 무게 파싱
+            measured_weight_str = row[i_weight].strip()
+            if not measured_weight_str:
+                raise ValueError("measured_weight 필드가 비어있습니다")
+            
+            measured_weight = float(measured_weight_str)
+            if measured_weight < 0:
+                raise ValueError("무게는 0 이상이어야 합니다")
+            
+            # 시약 찾기 (nfc_tag_uid, reagent_id, reagent_name 순서로 시도)
+            reagent = None
+            identifier = None
+            
+            # 1. NFC 태그 UID로 찾기
+            nfc_tag_uid = row[i_nfc].strip()
+            if nfc_tag_uid:
+                reagent = csvdb.get_reagent_by_nfc(nfc_tag_uid)
+                if reagent:
+                    identifier = f"NFC:{nfc_tag_uid}"
+            
+            # 2. reagent_id로 찾기
+            if not reagent:
+                reagent_id_str = row[i_id].strip()
+                if reagent_id_str:
+                    reagent_id = int(reagent_id_str)
+                    reagent = csvdb.get_reagent(str(reagent_id))
+                    if reagent:
+                        identifier = f"ID:{reagent_id}"
+            
+            # 3. reagent_name으로 찾기
+            if not reagent:
+                reagent_name = row[i_name].strip()
+                if reagent_name:
+                    reagent = csvdb.get_reagent_by_name(reagent_name)
+                    if reagent:
+                        identifier = f"Name:{reagent_name}"
+            
+            if not reagent:
+                raise ValueError(
+                    "시약을 찾을 수 없습니다. nfc_tag_uid, reagent_id, reagent_name 중 하나를 확인하세요"
                 )
             
-            return {
-                "success": True,
-                "message": "Scale tared successfully",
-                "timestamp": datetime.now().isoformat()
-            }
-        finally:
-            scale.disconnect()
+            # 이전 수량 (같은 시약이 앞 행에 있었으면 그 행의 측정값)
+            prev_qty = pending_qty.get(reagent["id"], reagent["quantity"])
             
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error taring scale: {str(e)}"
-        )
+            # 시약 수량 업데이트 (모았다가 마지막에 한 번에 저장)
+            pending_qty[reagent["id"]] = measured_weight
+            
+            # 사용 로그 기록
+            delta = measured_weight - prev_qty
+            note = row[i_note].strip()
+            operator = row[i_operator].strip()
+            timestamp_str = row[i_timestamp].strip()
+            
+            log_note = f"CSV 업로드: {note}" if note else "CSV 업로드"
+            if operator:
+                log_note += f" (측정자: {operator})"
+            if timestamp_str:
+                log_note += f" [시간: {timestamp_str}]"
+            
+            logs.append({
+                "reagent_id": reagent["id"],
+                "prev_qty": prev_qty,
+                "new_qty": measured_weight,
+                "delta": delta,
+                "source": "csv_upload",
+                "note": log_note,
+            })
+            
+            results["success"] += 1
+            results["updates"].append({
+                "row": row_num,
+                "identifier": identifier,
+                "reagent_name": reagent["name"],
+                "previous_quantity": prev_qty,
+                "new_quantity": measured_weight,
+                "delta": delta
+            })
+            
+        except ValueError as e:
+            results["failed"] += 1
+            results["errors"].append({
+                "row": row_num,
+                "error": str(e),
+                "data": dict(zip(header, row))
+            })
+        except Exception as e:
+            results["failed"] += 1
+            results["errors"].append({
+                "row": row_num,
+                "error": f"처리 중 오류: {str(e)}",
+                "data": dict(zip(header, row))
+            })
+    
+    # 시약 수정과 사용 기록 추가를 한 번의 쓰기 잠금 안에서 (수정이 저장된 뒤에 기록)
+    csvdb.update_reagents_bulk({rid: {"quantity": qty} for rid, qty in pending_qty.items()}, logs)
+    return results
 
 
-# ============= Scale Measurement CSV Upload Endpoints =============
+def _apply_measurement_file(binary: BinaryIO) -> Dict[str, Any]:
+    """업로드 파일을 스트리밍으로 읽어 _apply_measurement_rows에 전달
+
+    인코딩 오류가 있는 파일은 아무 행도 반영하기 전에 거부되도록 먼저 끝까지 디코딩만 해봄
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in iter(lambda: binary.read(64 * 1024), b""):
+        decoder.decode(chunk)
+    decoder.decode(b"", final=True)
+    binary.seek(0)
+    if not hasattr(binary, "readable"):
+        # Python 3.10 이하의 SpooledTemporaryFile은 TextIOWrapper로 감쌀 수 없어 줄 단위로 디코딩
+        return _apply_measurement_rows(csv.reader(codecs.iterdecode(binary, "utf-8-sig")))
+    text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")  # BOM 제거
+    try:
+        return _apply_measurement_rows(csv.reader(text))
+    finally:
+        text.detach()  # 업로드 파일은 FastAPI가 닫음
+
 
 @app.post("/api/scale/upload-measurements")
 async def upload_scale_measurements(file: UploadFile = File(...)):
@@ -952,132 +1161,9 @@ async def upload_scale_measurements(file: UploadFile = File(...)):
         )
     
     try:
-        # CSV 파일 읽기
-        contents = await file.read()
-        csv_text = contents.decode('utf-8-sig')  # BOM 제거
-        csv_reader = csv.DictReader(io.StringIO(csv_text))
-        
-        results = {
-            "total": 0,
-            "success": 0,
-            "failed": 0,
-            "errors": [],
-            "updates": []
-        }
-        
-        for row_num, row in enumerate(csv_reader, start=2):  # 헤더 다음부터
-            results["total"] += 1
-            
-            try:
-                # 측정 무게 파싱
-                measured_weight_str = row.get('measured_weight', '').strip()
-                if not measured_weight_str:
-                    raise ValueError("measured_weight 필드가 비어있습니다")
-                
-                measured_weight = float(measured_weight_str)
-                if measured_weight < 0:
-                    raise ValueError("무게는 0 이상이어야 합니다")
-                
-                # 시약 찾기 (nfc_tag_uid, reagent_id, reagent_name 순서로 시도)
-                reagent = None
-                identifier = None
-                
-                # 1. NFC 태그 UID로 찾기
-                nfc_tag_uid = row.get('nfc_tag_uid', '').strip()
-                if nfc_tag_uid:
-                    all_reagents = csvdb.list_all_reagents()
-                    norm_in = normalize_nfc_tag(nfc_tag_uid)
-                    for r in all_reagents:
-                        stored = r.get('nfc_tag_uid') or ''
-                        if stored == nfc_tag_uid:
-                            reagent = r
-                            identifier = f"NFC:{nfc_tag_uid}"
-                            break
-                        if norm_in and normalize_nfc_tag(stored) == norm_in:
-                            reagent = r
-                            identifier = f"NFC:{nfc_tag_uid}"
-                            break
-                
-                # 2. reagent_id로 찾기
-                if not reagent:
-                    reagent_id_str = row.get('reagent_id', '').strip()
-                    if reagent_id_str:
-                        reagent_id = int(reagent_id_str)
-                        reagent = csvdb.get_reagent(str(reagent_id))
-                        if reagent:
-                            identifier = f"ID:{reagent_id}"
-                
-                # 3. reagent_name으로 찾기
-                if not reagent:
-                    reagent_name = row.get('reagent_name', '').strip()
-                    if reagent_name:
-                        all_reagents = csvdb.list_all_reagents()
-                        for r in all_reagents:
-                            if r.get('name', '').strip() == reagent_name:
-                                reagent = r
-                                identifier = f"Name:{reagent_name}"
-                                break
-                
-                if not reagent:
-                    raise ValueError(
-                        "시약을 찾을 수 없습니다. nfc_tag_uid, reagent_id, reagent_name 중 하나를 확인하세요"
-                    )
-                
-                # 이전 수량 저장
-                prev_qty = reagent["quantity"]
-                
-                # 시약 수량 업데이트
-                updated = csvdb.update_reagent(
-                    str(reagent["id"]),
-                    {"quantity": measured_weight},
-                )
-                
-                # 사용 로그 기록
-                delta = measured_weight - prev_qty
-                note = row.get('note', '').strip()
-                operator = row.get('operator', '').strip()
-                timestamp_str = row.get('timestamp', '').strip()
-                
-                log_note = f"CSV 업로드: {note}" if note else "CSV 업로드"
-                if operator:
-                    log_note += f" (측정자: {operator})"
-                if timestamp_str:
-                    log_note += f" [시간: {timestamp_str}]"
-                
-                csvdb.add_usage_log(
-                    reagent_id=reagent["id"],
-                    prev_qty=prev_qty,
-                    new_qty=measured_weight,
-                    delta=delta,
-                    source="csv_upload",
-                    note=log_note,
-                )
-                
-                results["success"] += 1
-                results["updates"].append({
-                    "row": row_num,
-                    "identifier": identifier,
-                    "reagent_name": reagent["name"],
-                    "previous_quantity": prev_qty,
-                    "new_quantity": measured_weight,
-                    "delta": delta
-                })
-                
-            except ValueError as e:
-                results["failed"] += 1
-                results["errors"].append({
-                    "row": row_num,
-                    "error": str(e),
-                    "data": dict(row)
-                })
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append({
-                    "row": row_num,
-                    "error": f"처리 중 오류: {str(e)}",
-                    "data": dict(row)
-                })
-        
+        # 파일 전체를 메모리에 올리지 않고 업로드 임시 파일에서 한 행씩 읽음
+        results = await asyncio.to_thread(_apply_measurement_file, file.file)
+
         return {
             "message": f"CSV 파일 처리 완료: {results['success']}건 성공, {results['failed']}건 실패",
             "results": results,
@@ -1096,8 +1182,57 @@ async def upload_scale_measurements(file: UploadFile = File(...)):
         )
 
 
+# 저울 측정값 파일은 한 번 열어 두고 이어 씀 (요청마다 open/close 하지 않도록)
+SCALE_MEASUREMENTS_CSV = Path(__file__).parent.parent / "data" / "scale_measurements.csv"
+SCALE_MEASUREMENT_FIELDS = [
+    'nfc_tag_uid', 'reagent_id', 'reagent_name',
+    'measured_weight', 'timestamp', 'note', 'operator'
+]
+_scale_out: Dict[str, Any] = {"file": None, "writer": None, "ino": None}
+_scale_lock = threading.Lock()
+
+
+def _scale_writer() -> Any:
+    """열어 둔 측정값 파일의 csv.writer. _scale_lock 안에서 호출
+
+    처음 쓸 때, 또는 파일이 지워지거나 다른 파일로 바뀐 경우(업로드 후 정리 등)에만 다시 엶
+    """
+    f = _scale_out["file"]
+    if f is not None:
+        try:
+            st = os.stat(SCALE_MEASUREMENTS_CSV)
+            if (st.st_dev, st.st_ino) == _scale_out["ino"]:
+                return _scale_out["writer"]
+        except OSError:
+            pass
+        _scale_out["file"] = None
+        f.close()
+    
+    f = open(SCALE_MEASUREMENTS_CSV, 'a', newline='', encoding='utf-8-sig')
+    try:
+        st = os.fstat(f.fileno())
+        writer = csv.writer(f)
+        # 헤더 작성 (빈 파일일 때만)
+        if st.st_size == 0:
+            writer.writerow(SCALE_MEASUREMENT_FIELDS)
+    except BaseException:
+        f.close()
+        raise
+    _scale_out.update(file=f, writer=writer, ino=(st.st_dev, st.st_ino))
+    return writer
+
+
+def close_scale_file() -> None:
+    """열어 둔 측정값 파일 닫기 (앱 종료 시)"""
+    with _scale_lock:
+        f = _scale_out["file"]
+        _scale_out["file"] = None
+        if f is not None:
+            f.close()
+
+
 @app.post("/api/scale/save-measurement")
-async def save_scale_measurement_to_csv(
+def save_scale_measurement_to_csv(
     nfc_tag_uid: Optional[str] = None,
     reagent_id: Optional[int] = None,
     reagent_name: Optional[str] = None,
@@ -1110,47 +1245,31 @@ async def save_scale_measurement_to_csv(
     이 엔드포인트는 측정값을 즉시 DB에 반영하지 않고 CSV 파일에만 저장합니다.
     나중에 /api/scale/upload-measurements로 일괄 업로드할 수 있습니다.
     """
-    import os
-    from pathlib import Path
-    
-    # CSV 파일 경로
-    csv_file = Path(__file__).parent.parent / "data" / "scale_measurements.csv"
-    
-    # 파일이 없으면 헤더와 함께 생성
-    file_exists = csv_file.exists()
-    
+    timestamp = datetime.now().isoformat()  # 파일에 쓰는 값과 응답의 시각을 같게
     try:
-        with open(csv_file, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            
-            # 헤더 작성 (파일이 없을 때만)
-            if not file_exists:
-                writer.writerow([
-                    'nfc_tag_uid', 'reagent_id', 'reagent_name', 
-                    'measured_weight', 'timestamp', 'note', 'operator'
-                ])
-            
-            # 데이터 작성
+        with _scale_lock:
+            writer = _scale_writer()
             writer.writerow([
                 nfc_tag_uid or '',
                 reagent_id or '',
                 reagent_name or '',
                 measured_weight,
-                datetime.now().isoformat(),
+                timestamp,
                 note or '',
                 operator or ''
             ])
+            _scale_out["file"].flush()  # 측정값은 한 건씩 바로 파일에 남김 (파일은 열어 둔 채)
         
         return {
             "success": True,
             "message": "측정값이 CSV 파일에 저장되었습니다",
-            "file": str(csv_file),
+            "file": str(SCALE_MEASUREMENTS_CSV),
             "data": {
                 "nfc_tag_uid": nfc_tag_uid,
                 "reagent_id": reagent_id,
                 "reagent_name": reagent_name,
                 "measured_weight": measured_weight,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "note": note,
                 "operator": operator
             }
@@ -10,10 +10,19 @@ from typing import Optional, List, Dict
 import serial
 import serial.tools.list_ports
 
+# Weight patterns, compiled once (see ScaleReader._parse_weight)
+_UNIT_WEIGHT_RE = re.compile(r'([+-]?\d+\.?\d*)\s*(g|kg|lb|oz)', re.IGNORECASE)
+_GRAM_WEIGHT_RE = re.compile(r'([+-]?\d+\.?\d*)\s*g', re.IGNORECASE)
+_BARE_NUMBER_RE = re.compile(r'([+-]?\d+\.?\d+)')
+_UNIT_FACTORS = {'g': 1.0, 'kg': 1000.0, 'lb': 453.592, 'oz': 28.3495}
+
 
 class ScaleReader:
     """USB Scale reader class for communicating with digital scales."""
     
+    _MAX_PARTIAL = 4096  # Max bytes kept while waiting for a line terminator
+    _SETTLE_TIME = 0.5  # Max wait for the first data after opening the port
+    
     def __init__(self, port: Optional[str] = None, baudrate: int = 9600, timeout: float = 2.0):
         """Initialize scale reader.
         
@@ -28,6 +37,8 @@ class ScaleReader:
         self.timeout = timeout
         self.serial_connection: Optional[serial.Serial] = None
         self._last_weight = 0.0
+        self._rx_buffer = bytearray()  # Bytes received but not yet split into lines
+        self._resync = False  # Drop the first line after connecting (may be cut off or garbage)
         
     @staticmethod
     def list_available_ports() -> List[Dict[str, str]]:
@@ -73,12 +84,38 @@ class ScaleReader:
                 stopbits=serial.STOPBITS_ONE,
                 timeout=self.timeout
             )
-            time.sleep(0.5)  # Allow connection to stabilize
+            self._rx_buffer.clear()
+            # Many scales send a partial or garbage line right after the port
+            # opens; the first line is discarded by _read_latest_line
+            self._resync = True
+            self._wait_for_data(self._SETTLE_TIME)  # Allow connection to stabilize
             return True
         except (serial.SerialException, OSError) as e:
             print(f"Failed to connect to scale on {self.port}: {e}")
             return False
     
+    def _wait_for_data(self, max_wait: float) -> bool:
+        """Wait up to ``max_wait`` seconds for the first bytes after opening the port.
+        
+        Polls ``in_waiting`` with a short, doubling backoff against a monotonic
+        deadline, so a scale that streams continuously is ready after a few
+        milliseconds instead of always paying the full settle time.
+        
+        Returns:
+            True if data arrived before the deadline
+        """
+        ser = self.serial_connection
+        deadline = time.monotonic() + max_wait
+        delay = 0.01
+        while True:
+            if ser.in_waiting:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.1)
+    
     def disconnect(self):
         """Disconnect from the scale."""
         if self.serial_connection and self.serial_connection.is_open:
@@ -95,11 +132,8 @@ class ScaleReader:
             return None
         
         try:
-            # Clear input buffer
-            self.serial_connection.reset_input_buffer()
-            
-            # Read data from scale
-            raw_data = self.serial_connection.readline()
+            # Read the newest complete line from the scale
+            raw_data = self._read_latest_line()
             
             if not raw_data:
                 return self._last_weight
@@ -119,6 +153,48 @@ class ScaleReader:
             print(f"Error reading from scale: {e}")
             return None
     
+    def _read_latest_line(self) -> Optional[bytes]:
+        """Drain the serial input buffer and return the newest complete line.
+        
+        Everything reported by ``in_waiting`` is read in one call and split on
+        newlines, so a burst of lines costs a single read instead of one
+        ``readline()`` per line. Older lines are dropped (same freshness as the
+        previous ``reset_input_buffer()``) and a trailing partial line is kept
+        for the next call. The first line after ``connect()`` is discarded, since
+        the port may have opened mid-line. Blocks, up to the port timeout, only
+        when no complete line is buffered yet.
+        
+        Returns:
+            The newest non-empty line, or None if the read timed out
+        """
+        ser = self.serial_connection
+        buf = self._rx_buffer
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            waiting = ser.in_waiting
+            if waiting:
+                buf.extend(ser.read(waiting))
+            elif b"\n" not in buf:
+                chunk = ser.read(1)  # Wait for the scale to send something
+                if not chunk:
+                    return None
+                buf.extend(chunk)
+                continue
+            
+            if b"\n" in buf:
+                *lines, partial = buf.split(b"\n")
+                if self._resync:
+                    del lines[0]
+                    self._resync = False
+                buf[:] = partial[-self._MAX_PARTIAL:]
+                for line in reversed(lines):
+                    if line.strip():
+                        return bytes(line)
+            elif len(buf) > self._MAX_PARTIAL:
+                # No line terminator from this device; don't grow without bound
+                del buf[:-self._MAX_PARTIAL]
+        return None
+    
     def _parse_weight(self, data: str) -> Optional[float]:
         """Parse weight value from scale data string.
         
@@ -137,29 +213,28 @@ class ScaleReader:
         if not data:
             return None
         
+        # Fast path: plain "<number> g" lines, the usual continuous output
+        if data[-1] in 'gG':
+            body = data[:-1].rstrip()
+            digits = body.lstrip('+-')
+            if digits[:1].isdigit() and digits.replace('.', '', 1).isdigit():
+                try:
+                    return float(body)
+                except ValueError:
+                    pass
+        
         # Pattern 1: Standard format with unit (e.g., "123.4 g", "0.123 kg")
-        match = re.search(r'([+-]?\d+\.?\d*)\s*(g|kg|lb|oz)', data, re.IGNORECASE)
+        match = _UNIT_WEIGHT_RE.search(data)
         if match:
-            value = float(match.group(1))
-            unit = match.group(2).lower()
-            
-            # Convert to grams
-            if unit == 'kg':
-                value *= 1000
-            elif unit == 'lb':
-                value *= 453.592
-            elif unit == 'oz':
-                value *= 28.3495
-            
-            return value
+            return float(match.group(1)) * _UNIT_FACTORS[match.group(2).lower()]
         
         # Pattern 2: Format with status and unit (e.g., "ST,GS,+00123.4g")
-        match = re.search(r'([+-]?\d+\.?\d*)\s*g', data, re.IGNORECASE)
+        match = _GRAM_WEIGHT_RE.search(data)
         if match:
             return float(match.group(1))
         
         # Pattern 3: Just numbers (assume grams)
-        match = re.search(r'([+-]?\d+\.?\d+)', data)
+        match = _BARE_NUMBER_RE.search(data)
         if match:
             return float(match.group(1))
         
@@ -219,36 +294,35 @@ class ScaleReader:
         Returns:
             Stable weight in grams, or None if could not get stable reading
         """
-        stable_start_time = None
+        stable_deadline = 0.0
         stable_value = None
         check_interval = 0.1  # Check every 100ms
         
+        # Hot loop: bind globals/attributes to locals once. monotonic() is immune
+        # to wall-clock adjustments while timing the stability window.
+        read_weight = self.read_weight
+        monotonic = time.monotonic
+        sleep = time.sleep
+        
         for attempt in range(max_attempts * 10):  # More attempts for longer duration
-            current_weight = self.read_weight()
+            current_weight = read_weight()
             
             if current_weight is None:
-                stable_start_time = None
                 stable_value = None
-                time.sleep(check_interval)
+                sleep(check_interval)
                 continue
             
             # Check if this weight is similar to the stable value
-            if stable_value is not None:
-                if abs(current_weight - stable_value) <= tolerance:
-                    # Weight is still stable, check if duration met
-                    elapsed = time.time() - stable_start_time
-                    if elapsed >= stable_duration:
-                        return stable_value
-                else:
-                    # Weight changed, reset stability tracking
-                    stable_start_time = time.time()
-                    stable_value = current_weight
+            if stable_value is not None and -tolerance <= current_weight - stable_value <= tolerance:
+                # Weight is still stable, check if duration met
+                if monotonic() >= stable_deadline:
+                    return stable_value
             else:
-                # First stable reading
-                stable_start_time = time.time()
+                # First reading, or weight changed: (re)start stability tracking
+                stable_deadline = monotonic() + stable_duration
                 stable_value = current_weight
             
-            time.sleep(check_interval)
+            sleep(check_interval)
         
         return None
     
@@ -129,3 +129,15 @@ class LocalChemCreate(LocalChemBase):
 
 class LocalChemOut(LocalChemBase):
     pass
+
+
+class LocalChemBulkCreate(BaseModel):
+    items: List[LocalChemCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class LocalChemBulkDelete(BaseModel):
+    names: List[str] = Field(..., min_length=1, max_length=1000)
+
+
+class LocalChemBulkDeleteOut(BaseModel):
+    deleted: List[str]
@@ -1,11 +1,188 @@
 """Utility helpers for the reagent-ology backend."""
 from __future__ import annotations
 
+import os
 import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional, TextIO, Tuple
 
 
+_NON_SLUG = re.compile(r"[^a-zA-Z0-9]+")
+
+
+@lru_cache(maxsize=4096)
 def slugify(*values: str) -> str:
-    """Generate a URL-friendly slug from provided string fragments."""
+    """Generate a URL-friendly slug from provided string fragments.
+
+    Pure and called on every create/rename, so results are memoized.
+    """
     combined = "-".join(v for v in values if v)
-    normalized = re.sub(r"[^a-zA-Z0-9]+", "-", combined).strip("-").lower()
+    normalized = _NON_SLUG.sub("-", combined).strip("-").lower()
     return normalized or "reagent"
+
+
+# deletion table for str.translate: strips every ASCII non-hex character in one C pass
+_NON_HEX = "".join(chr(c) for c in range(128) if chr(c) not in "0123456789abcdefABCDEF")
+_HEX_ONLY = str.maketrans("", "", _NON_HEX)
+
+
+def normalize_nfc_tag(value: Optional[str]) -> Optional[str]:
+    """Normalize NFC UID by removing separators and uppercasing.
+    Examples:
+    '04:E4:B4:C2:43:20:90' -> '04E4B4C2432090'
+    '04e4b4c2432090' -> '04E4B4C2432090'
+    Returns None if input is falsy after stripping.
+    """
+    if value is None:
+        return None
+    s = value.strip()
+    if not s:
+        return None
+    # keep hex digits only (the table covers ASCII; anything else is dropped separately)
+    s = s.translate(_HEX_ONLY)
+    if not s.isascii():
+        s = "".join(c for c in s if c.isascii())
+    return s.upper() or None
+
+
+# fdatasync skips flushing metadata such as mtime; not available on Windows/macOS
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename in ``directory`` (POSIX only; a no-op elsewhere)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[TextIO]:
+    """Open ``path`` for writing through a temp file that replaces it on success.
+
+    The temp file lives in the same directory so ``os.replace`` is atomic:
+    readers see either the old or the new file, never a half-written one, and
+    the original is left untouched if writing fails. The data is synced to
+    disk before the rename and the directory entry after it, so a crash or
+    power loss cannot leave an empty or torn file behind.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)  # mkstemp creates 0600
+        except FileNotFoundError:
+            pass
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            yield f
+            f.flush()
+            _fdatasync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(path.parent)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class RWLock:
+    """Reader/writer lock: any number of readers, or a single writer.
+
+    Waiting writers block new readers so a steady stream of GETs cannot
+    starve writes. A thread that already holds a read lock may take it again
+    without waiting (otherwise it would deadlock behind a waiting writer);
+    the write lock is not reentrant.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._local = threading.local()  # per-thread read_lock nesting depth
+
+    @contextmanager
+    def read_lock(self) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class TTLCache:
+    """Small dict-backed cache whose entries expire ``ttl`` seconds after being set.
+
+    When full, the oldest entry is evicted. Not thread-safe: meant for state
+    touched only from the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data.pop(key, None)
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -4,24 +4,39 @@ import time
 import sys
 
 API_BASE = "http://127.0.0.1:8000"
+WAIT_SEC = 30  # 최대 대기 시간
 
-print("FastAPI 서버 연결 대기 중...")
-print("서버 주소:", API_BASE)
 
-for i in range(30):  # 30초 동안 시도
-    try:
-        response = requests.get(f"{API_BASE}/api/reagents", timeout=2)
-        if response.status_code in [200, 404, 422]:
-            print(f"\n✅ 서버 연결 성공! (시도 {i+1})")
-            print(f"서버가 {API_BASE} 에서 실행 중입니다.")
-            sys.exit(0)
-    except:
-        print(f".", end="", flush=True)
-        time.sleep(1)
+def main() -> int:
+    print("FastAPI 서버 연결 대기 중...")
+    print("서버 주소:", API_BASE)
 
-print("\n\n❌ 서버에 연결할 수 없습니다.")
-print("\n다음 명령으로 서버를 시작하세요:")
-print("  cd reagent-ology")
-print("  $env:PYTHONPATH=(Get-Location).Path")
-print("  uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000")
-sys.exit(1)
+    deadline = time.monotonic() + WAIT_SEC
+    delay = 0.25  # 처음엔 빠르게, 응답이 없으면 점점 간격을 늘림
+    attempt = 0
+    # 재시도마다 새 TCP 연결을 만들지 않도록 세션(keep-alive)을 재사용
+    with requests.Session() as session:
+        while time.monotonic() < deadline:
+            attempt += 1
+            try:
+                response = session.get(f"{API_BASE}/api/reagents", timeout=2)
+                if response.status_code in [200, 404, 422]:
+                    print(f"\n✅ 서버 연결 성공! (시도 {attempt})")
+                    print(f"서버가 {API_BASE} 에서 실행 중입니다.")
+                    return 0
+            except requests.RequestException:
+                pass
+            print(f".", end="", flush=True)
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+    print("\n\n❌ 서버에 연결할 수 없습니다.")
+    print("\n다음 명령으로 서버를 시작하세요:")
+    print("  cd reagent-ology")
+    print("  $env:PYTHONPATH=(Get-Location).Path")
+    print("  uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,11 +45,12 @@ def main():
         import uvicorn
         import fastapi
         import serial
+        import orjson
     except ImportError as e:
         print(f"❌ 필요한 패키지가 설치되지 않았습니다: {e}")
         print()
         print("다음 명령어로 설치하세요:")
-        print("  pip install fastapi uvicorn pyserial python-multipart httpx")
+        print("  pip install fastapi uvicorn pyserial python-multipart httpx orjson")
         input("Enter 키를 눌러 종료...")
         sys.exit(1)
     
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""CSV 저장소 동작 테스트 (임시 data 디렉토리 사용, 실제 data/는 건드리지 않음)
+
+직접 실행하거나 pytest로 실행:
+    python test_csv_storage.py
+    python -m pytest -q test_csv_storage.py
+"""
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from backend import csvdb, localdb
+
+
+@contextmanager
+def temp_data_dir() -> Iterator[Path]:
+    """csvdb/localdb가 빈 임시 디렉토리를 쓰도록 경로와 캐시를 바꾸고, 끝나면 원래대로 되돌림
+    
+    pytest로 여러 테스트 모듈을 함께 돌려도 다른 모듈에 상태가 새지 않도록
+    모듈 전역(경로, 캐시, 저장 오류 상태)을 복원하고 임시 디렉토리를 지움
+    """
+    csvdb.flush()
+    saved_paths = (csvdb.DATA_DIR, csvdb.REAGENTS_CSV, csvdb.USAGE_CSV, localdb.DATA_DIR, localdb.CSV_PATH)
+    saved_state = [(d, dict(d)) for d in (csvdb._CACHE, csvdb._LOG_CACHE, csvdb._LOG_ID, localdb._CACHE)]
+    tmp = Path(tempfile.mkdtemp())
+    csvdb.DATA_DIR = tmp
+    csvdb.REAGENTS_CSV = tmp / "reagents.csv"
+    csvdb.USAGE_CSV = tmp / "usage_logs.csv"
+    localdb.DATA_DIR = tmp
+    localdb.CSV_PATH = tmp / "autocomplete.csv"
+    csvdb._CACHE.update(items=None, key=None, dirty=False)
+    csvdb._LOG_CACHE.update(items=None, key=None, by_reagent=None)
+    csvdb._LOG_ID.update(key=None, max_id=None)
+    localdb._CACHE.update(items=None, key=None)
+    try:
+        yield tmp
+    finally:
+        try:
+            csvdb.flush()  # 백그라운드 저장이 지운 디렉토리에 쓰지 않도록 먼저 마무리
+        except csvdb.StorageError:
+            pass
+        csvdb._writer["error"] = None
+        (csvdb.DATA_DIR, csvdb.REAGENTS_CSV, csvdb.USAGE_CSV, localdb.DATA_DIR, localdb.CSV_PATH) = saved_paths
+        for state, original in saved_state:
+            state.clear()
+            state.update(original)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_tail_read_skips_multiline_note():
+    """여러 줄 note의 조각이 우연히 필드 수가 맞아도 기록으로 읽지 않아야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({"slug": "tail-test", "name": "Tail Test", "formula": "X", "location": "A"})
+        # 두 번째 물리적 줄이 쉼표 7개 → 헤더와 같은 8칸 조각이 됨
+        note = "first line\n999,%d,1,1,1,fake,x" % reagent["id"]
+        csvdb.add_usage_log(reagent["id"], prev_qty=5, new_qty=4, delta=-1, source="test", note=note)
+        csvdb._LOG_CACHE["items"] = None  # 캐시가 비어 있어야 파일 끝부분만 읽는 경로를 탐
+
+        logs = csvdb.get_usage_logs(reagent["id"], limit=1)
+        assert [log["note"] for log in logs] == [note], logs
+        assert csvdb._last_log_id() == logs[0]["id"]
+        print("✓ 여러 줄 note가 있어도 최근 기록을 올바르게 읽음")
+
+
+def test_update_survives_flush_and_reload():
+    """수정 → flush() → 파일에서 다시 읽어도 바뀐 값이 남아 있어야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({
+            "slug": "flush-test", "name": "Flush Test", "formula": "F", "location": "A",
+            "quantity": 10.0, "density": 2.0, "state": "liquid",
+        })
+        csvdb.update_reagent(str(reagent["id"]), {"quantity": 4.0, "location": "B"})
+        csvdb.flush()
+
+        on_disk = {r.id: r for r in csvdb._read_reagents()}  # 캐시를 거치지 않고 파일을 직접 파싱
+        saved = on_disk[reagent["id"]]
+        assert (saved.quantity, saved.location, saved.volume_ml) == (4.0, "B", 2.0), saved
+        print("✓ 수정 내용이 flush 후 파일에 저장됨")
+
+
+@contextmanager
+def failing_disk() -> Iterator[None]:
+    """reagents.csv 저장이 디스크 공간 부족으로 실패하는 상태를 흉내냄"""
+    original_atomic_write = csvdb.atomic_write
+
+    @contextmanager
+    def failing_atomic_write(path, *args, **kwargs):
+        raise OSError(28, "No space left on device")
+        yield
+
+    csvdb.atomic_write = failing_atomic_write
+    try:
+        yield
+    finally:
+        csvdb.atomic_write = original_atomic_write
+
+
+def test_write_failure_rejects_change():
+    """바로 저장하는 기본 모드에서는 저장 실패가 그 변경의 StorageError로 드러나고 메모리도 그대로여야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({"slug": "sync-fail", "name": "Sync Fail", "formula": "F", "location": "A"})
+        rid = str(reagent["id"])
+        with failing_disk():
+            try:
+                csvdb.update_reagent_with_log(rid, {"quantity": 1.0}, source="use")
+                raise AssertionError("저장 실패가 성공으로 처리됨")
+            except csvdb.StorageError:
+                pass
+        assert csvdb.get_reagent(rid)["quantity"] == 0.0
+        assert csvdb.get_usage_logs(reagent["id"]) == []
+        assert csvdb.storage_error() is None  # 밀린 변경이 없으므로 다음 변경은 다시 시도됨
+        csvdb.update_reagent(rid, {"quantity": 2.0})
+        assert {r.id: r.quantity for r in csvdb._read_reagents()}[reagent["id"]] == 2.0
+        print("✓ 저장 실패 시 변경이 거부되고, 복구 후 바로 저장됨")
+
+
+def test_write_behind_failure_is_visible():
+    """백그라운드 저장이 실패하면 storage_error, 다음 변경, flush()에서 실패가 드러나야 함"""
+    with temp_data_dir():
+        csvdb.WRITE_BEHIND = True
+        try:
+            reagent = csvdb.create_reagent({"slug": "fail-test", "name": "Fail Test", "formula": "F", "location": "A"})
+            rid = str(reagent["id"])
+            with failing_disk():
+                csvdb.update_reagent(rid, {"quantity": 1.0})  # 저장은 백그라운드에서 실패
+                deadline = time.monotonic() + 3
+                while csvdb.storage_error() is None and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                assert "No space left" in (csvdb.storage_error() or ""), csvdb.storage_error()
+
+                try:
+                    csvdb.update_reagent(rid, {"quantity": 2.0})
+                    raise AssertionError("저장 실패 중인데 변경이 성공으로 처리됨")
+                except csvdb.StorageError:
+                    pass
+                assert csvdb.get_reagent(rid)["quantity"] == 1.0  # 거부된 변경은 메모리에도 반영되지 않음
+
+                try:
+                    csvdb.flush()
+                    raise AssertionError("flush()가 저장 실패를 알리지 않음")
+                except csvdb.StorageError:
+                    pass
+
+            csvdb.flush()  # 디스크가 복구되면 밀린 변경을 저장하고 오류 상태 해제
+            assert csvdb.storage_error() is None
+            assert {r.id: r.quantity for r in csvdb._read_reagents()}[reagent["id"]] == 1.0
+        finally:
+            csvdb.WRITE_BEHIND = False
+        print("✓ 백그라운드 저장 실패가 storage_error / StorageError로 드러나고, 복구 후 저장됨")
+
+
+def test_list_all_reagents_returns_copies():
+    """반환된 dict를 고쳐도 다음 조회 결과에는 영향이 없어야 함"""
+    with temp_data_dir():
+        csvdb.create_reagent({"slug": "copy-test", "name": "Copy Test", "formula": "C", "location": "A", "ghs": ["Toxic"]})
+        first = csvdb.list_all_reagents()
+        first[0]["name"] = "changed"
+        first[0]["ghs"].append("Flammable")
+        first[0]["extra"] = 1
+        second = csvdb.list_all_reagents()
+        assert second[0]["name"] == "Copy Test" and second[0]["ghs"] == ["Toxic"] and "extra" not in second[0], second
+        print("✓ list_all_reagents는 캐시와 분리된 복사본을 반환")
+
+
+def test_indexes_follow_updates():
+    """slug/NFC/이름을 바꾸면 새 값으로만 조회되어야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({
+            "slug": "index-old", "name": "Index Old", "formula": "I", "location": "A", "nfc_tag_uid": "AA:01",
+        })
+        csvdb.update_reagent(str(reagent["id"]), {"slug": "index-new", "name": "Index New", "nfc_tag_uid": "BB:02"})
+        assert csvdb.get_reagent("index-old") is None
+        assert csvdb.get_reagent("index-new")["id"] == reagent["id"]
+        assert csvdb.get_reagent_by_nfc("AA01") is None
+        assert csvdb.get_reagent_by_nfc("bb:02")["id"] == reagent["id"]
+        assert csvdb.get_reagent_by_name("Index Old") is None
+        assert csvdb.get_reagent_by_name("Index New")["id"] == reagent["id"]
+        print("✓ 수정 후 slug/NFC/이름 인덱스가 새 값을 가리킴")
+
+
+def test_rejected_update_leaves_no_usage_log():
+    """저장이 거부된 수정은 사용 기록도 남기지 않고, 성공하면 이전 양 → 새 양이 기록되어야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({"slug": "log-test", "name": "Log Test", "formula": "L", "location": "A", "quantity": 10.0})
+        rid = str(reagent["id"])
+        csvdb._writer["error"] = OSError(28, "No space left on device")  # 저장이 실패하고 있는 상태
+        try:
+            csvdb.update_reagent_with_log(rid, {"quantity": 7.0}, source="use", delta=-3.0)
+            raise AssertionError("저장 실패 중인데 변경이 성공으로 처리됨")
+        except csvdb.StorageError:
+            pass
+        finally:
+            csvdb._writer["error"] = None
+        assert csvdb.get_usage_logs(reagent["id"]) == []
+        assert csvdb.get_reagent(rid)["quantity"] == 10.0
+
+        updated = csvdb.update_reagent_with_log(rid, {"quantity": 7.0}, source="use", delta=-3.0)
+        logs = csvdb.get_usage_logs(reagent["id"])
+        assert updated["quantity"] == 7.0
+        assert [(log["prev_qty"], log["new_qty"], log["delta"], log["source"]) for log in logs] == [(10.0, 7.0, -3.0, "use")], logs
+        print("✓ 저장이 거부되면 사용 기록도 남지 않음")
+
+
+def test_bulk_update_logs_after_save():
+    """일괄 수정이 거부되면 기록도 없고, 성공하면 있는 시약의 기록만 추가되어야 함"""
+    with temp_data_dir():
+        reagent = csvdb.create_reagent({"slug": "bulk-test", "name": "Bulk Test", "formula": "B", "location": "A", "quantity": 5.0})
+        rid = reagent["id"]
+        entries = [
+            {"reagent_id": rid, "prev_qty": 5.0, "new_qty": 3.0, "delta": -2.0, "source": "csv_upload"},
+            {"reagent_id": rid + 100, "prev_qty": 1.0, "new_qty": 0.0, "delta": -1.0, "source": "csv_upload"},
+        ]
+        with failing_disk():
+            try:
+                csvdb.update_reagents_bulk({rid: {"quantity": 3.0}, rid + 100: {"quantity": 0.0}}, entries)
+                raise AssertionError("저장 실패가 성공으로 처리됨")
+            except csvdb.StorageError:
+                pass
+        assert csvdb.get_usage_logs(rid) == [] and csvdb.get_usage_logs(rid + 100) == []
+
+        results = csvdb.update_reagents_bulk({rid: {"quantity": 3.0}, rid + 100: {"quantity": 0.0}}, entries)
+        assert list(results) == [rid] and results[rid]["quantity"] == 3.0, results
+        assert [log["delta"] for log in csvdb.get_usage_logs(rid)] == [-2.0]
+        assert csvdb.get_usage_logs(rid + 100) == []  # 없는 시약의 기록은 남기지 않음
+        print("✓ 일괄 수정이 저장된 뒤에만 사용 기록 추가")
+
+
+def test_usage_paging_with_before():
+    """limit/before로 페이지를 넘기면 최신순으로 빠짐없이, 겹치지 않게 이어져야 함 (캐시가 비었을 때/찼을 때 모두)"""
+    with temp_data_dir():
+        target = csvdb.create_reagent({"slug": "page-test", "name": "Page Test", "formula": "P", "location": "A"})
+        other = csvdb.create_reagent({"slug": "page-other", "name": "Page Other", "formula": "O", "location": "A"})
+        expected = []
+        for i in range(23):
+            log = csvdb.add_usage_log(target["id"], prev_qty=i, new_qty=i + 1, delta=1, source="test")
+            expected.append(log["id"])
+            csvdb.add_usage_log(other["id"], prev_qty=i, new_qty=i + 1, delta=1, source="test")  # 사이사이 다른 시약 기록
+        expected.reverse()
+
+        for cold in (True, False):
+            ids, before = [], None
+            while True:
+                if cold:
+                    csvdb._LOG_CACHE["items"] = None  # 파일 끝부분만 읽는 경로
+                else:
+                    with csvdb._rwlock.read_lock():
+                        csvdb._read_logs_cached()  # 시약별 색인을 쓰는 경로
+                page = csvdb.get_reagent_usage(target["slug"], limit=5, before=before)
+                assert len(page) <= 5, page
+                if not page:
+                    break
+                ids.extend(log["id"] for log in page)
+                before = page[-1]["id"]
+            assert ids == expected, (cold, ids)
+        print("✓ before로 넘긴 페이지가 최신순으로 빠짐없이 이어짐")
+
+
+def main():
+    print("=" * 60)
+    print("CSV Storage Test")
+    print("=" * 60)
+    test_tail_read_skips_multiline_note()
+    test_update_survives_flush_and_reload()
+    test_write_failure_rejects_change()
+    test_write_behind_failure_is_visible()
+    test_list_all_reagents_returns_copies()
+    test_indexes_follow_updates()
+    test_rejected_update_leaves_no_usage_log()
+    test_bulk_update_logs_after_save()
+    test_usage_paging_with_before()
+    print("\n테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()
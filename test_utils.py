@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""backend/utils.py의 RWLock / TTLCache 동작 테스트
+
+직접 실행하거나 pytest로 실행:
+    python test_utils.py
+    python -m pytest -q test_utils.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from backend.utils import RWLock, TTLCache
+
+
+def test_rwlock_readers_share():
+    """읽기 잠금은 여러 스레드가 동시에 잡을 수 있어야 함"""
+    lock = RWLock()
+    both_inside = threading.Barrier(2, timeout=2)
+    errors = []
+
+    def reader():
+        with lock.read_lock():
+            try:
+                both_inside.wait()
+            except threading.BrokenBarrierError as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert not errors, "두 읽기 스레드가 동시에 잠금 안에 들어가지 못함"
+    print("✓ 읽기 잠금 동시 진입")
+
+
+def test_rwlock_writer_excludes_readers():
+    """쓰기 잠금은 읽기가 끝날 때까지 기다리고, 기다리는 동안 새 읽기도 막아야 함"""
+    lock = RWLock()
+    events = []
+    reader_in = threading.Event()
+    release_reader = threading.Event()
+
+    def first_reader():
+        with lock.read_lock():
+            events.append("reader1 in")
+            reader_in.set()
+            release_reader.wait(2)
+            events.append("reader1 out")
+
+    def writer():
+        with lock.write_lock():
+            events.append("writer")
+
+    def second_reader():
+        with lock.read_lock():
+            events.append("reader2")
+
+    t1 = threading.Thread(target=first_reader)
+    t1.start()
+    reader_in.wait(2)
+    tw = threading.Thread(target=writer)
+    tw.start()
+    time.sleep(0.05)  # writer가 대기 상태가 되도록
+    t2 = threading.Thread(target=second_reader)
+    t2.start()
+    time.sleep(0.05)
+    assert events == ["reader1 in"], events  # writer도, 뒤에 온 reader도 아직 못 들어감
+    release_reader.set()
+    for t in (t1, tw, t2):
+        t.join(5)
+    assert events == ["reader1 in", "reader1 out", "writer", "reader2"], events
+    print("✓ 쓰기 잠금은 읽기와 배타적이고, 대기 중인 쓰기가 새 읽기보다 먼저")
+
+
+def test_rwlock_nested_read_with_waiting_writer():
+    """읽기 잠금을 가진 스레드는 writer가 기다려도 다시 읽기 잠금을 잡을 수 있어야 함"""
+    lock = RWLock()
+    done = threading.Event()
+
+    def writer():
+        with lock.write_lock():
+            pass
+
+    def nested_reader():
+        with lock.read_lock():
+            tw = threading.Thread(target=writer, daemon=True)
+            tw.start()
+            time.sleep(0.05)  # writer가 대기 상태가 되도록
+            with lock.read_lock():
+                done.set()
+
+    t = threading.Thread(target=nested_reader, daemon=True)
+    t.start()
+    t.join(2)
+    assert done.is_set(), "중첩 읽기 잠금이 대기 중인 writer 뒤에서 교착됨"
+    print("✓ 중첩 읽기 잠금")
+
+
+def test_ttl_cache_expiry():
+    """TTL이 지나면 항목이 사라지고, 가득 차면 가장 오래된 항목부터 밀려남"""
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None and cache.get("b") == 2 and cache.get("c") == 3
+    print("✓ TTL 만료 및 최대 크기 제한")
+
+
+def main():
+    print("=" * 60)
+    print("Utils Test")
+    print("=" * 60)
+    test_rwlock_readers_share()
+    test_rwlock_writer_excludes_readers()
+    test_rwlock_nested_read_with_waiting_writer()
+    test_ttl_cache_expiry()
+    print("\n테스트 완료!")
+
+
+if __name__ == "__main__":
+    main()